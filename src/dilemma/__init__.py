@@ -4,12 +4,13 @@ __init__ file.
 
 from .errors import messages
 from .version import __version__
-from .lang import evaluate, compile_expression, ProcessedContext
+from .lang import evaluate, evaluate_cached, compile_expression, ProcessedContext
 from .errors import exc
 
 __all__ = [
     "__version__",
     "evaluate",
+    "evaluate_cached",
     "compile_expression",
     "ProcessedContext",
     "messages",
@@ -0,0 +1,279 @@
+"""
+Compile Lark parse trees into Python functions.
+
+Lark's Transformer resolves the handler for every node by name, inspects its
+v_args wrapper and builds a child list through a generator each time a tree is
+transformed. compile_tree() does that work once per tree: it generates the
+source of a single function that calls each node's (already resolved) handler
+in post-order, storing results in locals, and compiles it with the builtin
+compile(). Evaluating an expression is then one Python frame plus the handler
+calls themselves.
+
+Rules a transformer lists in its CONSTANT_RULES attribute are evaluated while
+compiling when all of their children are constants, and the generated function
+just refers to the resulting value. Binary rules in its SHORT_CIRCUIT_RULES
+mapping only evaluate their right operand when the left one doesn't already
+decide the result, like Python's own and/or. Single-child rules in its
+PASS_THROUGH_RULES, such as parentheses, take their child's value without a
+handler call at all. Repeated occurrences of a node of its REUSABLE_RULES, such
+as the same variable, are evaluated once and the value reused. Handlers marked
+with python_operator() are emitted as the operator itself, so CPython's
+specializing interpreter can pick its typed fast paths (int + int, float <
+float, ...).
+
+Only generated identifiers appear in the source. Handlers, tokens, constants
+and tree nodes are passed to the function through its globals, never
+interpolated, so no expression text is ever executed as Python.
+"""
+
+import itertools
+from typing import Any, Callable, Protocol
+
+from lark import Tree, v_args
+
+
+class Program(Protocol):
+    """A compiled tree: called with a transformer instance, returns the tree's value"""
+
+    # True when the whole tree was evaluated at compile time
+    constant: bool
+
+    def __call__(self, transformer: Any) -> Any: ...
+
+
+# The visit_wrapper Lark attaches to handlers decorated with @v_args(inline=True)
+_INLINE_WRAPPER = getattr(v_args(inline=True)(lambda *args: None), "visit_wrapper")
+
+
+def python_operator(symbol: str, types: tuple[type, ...] | None = None):
+    """
+    Mark a binary handler as computing Python's `left <symbol> right`.
+
+    Compiled programs then apply the operator directly instead of calling the
+    handler. When types is given, that only holds for operands of exactly those
+    types: the operator is guarded by a type check, falling back to the handler
+    for anything else. Operands that are constants are checked at compile time.
+
+    Args:
+        symbol: A Python binary operator, e.g. "+" or "<"
+        types: The operand types the handler is equivalent to the operator for,
+            or None for all types
+    """
+
+    def decorate(func):
+        func.python_operator = (symbol, frozenset(types) if types else None)
+        return func
+
+    return decorate
+
+
+def compile_tree(tree: Tree | Any, transformer_class: type) -> Program:
+    """
+    Compile a parse tree into a function evaluated against a transformer instance.
+
+    Handlers are looked up on transformer_class once, at compile time, so the
+    resulting program must be run with instances of that class. Rules without a
+    handler fall back to the transformer's own dispatch. Unlike
+    Transformer.transform, exceptions raised by a handler propagate unwrapped,
+    without building a VisitError for every failure; only rules dispatched
+    through the transformer's _call_userfunc still raise VisitError.
+
+    Nodes of the rules in transformer_class.CONSTANT_RULES whose children are
+    all constant are evaluated here, with a transformer_class() instance. If
+    that raises, the node is left to raise when the program runs instead.
+
+    Args:
+        tree: The parse tree (or a leaf token) to compile
+        transformer_class: The Transformer subclass providing rule handlers
+
+    Returns:
+        A callable taking a transformer instance and returning the tree's value.
+        Its constant attribute is True when the whole tree was evaluated here;
+        the program then ignores its argument, which may be None.
+    """
+    compiler = _Compiler(transformer_class)
+    result = compiler.emit(tree)
+
+    body = "".join(f"    {line}\n" for line in compiler.lines)
+    source = f"def program(transformer):\n{body}    return {result}\n"
+    exec(compile(source, "<dilemma>", "exec"), compiler.namespace)
+    program = compiler.namespace["program"]
+    program.constant = result in compiler.constants
+    return program
+
+
+class _Compiler:
+    """Generates the statements of one program."""
+
+    def __init__(self, transformer_class: type):
+        self.transformer_class = transformer_class
+        self.constant_rules: frozenset[str] = getattr(
+            transformer_class, "CONSTANT_RULES", frozenset()
+        )
+        self.short_circuit_rules: dict[str, bool] = getattr(
+            transformer_class, "SHORT_CIRCUIT_RULES", {}
+        )
+        self.pass_through_rules: frozenset[str] = getattr(
+            transformer_class, "PASS_THROUGH_RULES", frozenset()
+        )
+        self.reusable_rules: frozenset[str] = getattr(
+            transformer_class, "REUSABLE_RULES", frozenset()
+        )
+        self.namespace: dict[str, Any] = {}
+        self.lines: list[str] = []
+        # Names in namespace holding values known at compile time
+        self.constants: set[str] = set()
+        self.counter = itertools.count()
+        self._instance = None
+        self._type_names: dict[frozenset, str] = {}
+        # Reusable nodes already evaluated on every path to the current line
+        self._evaluated: dict[Tree, str] = {}
+
+    def emit(self, node: Tree | Any) -> str:
+        """
+        Append the statements evaluating node to lines.
+
+        Returns:
+            The name of the global (for constants) or local holding the node's value
+        """
+        index = next(self.counter)
+
+        if not isinstance(node, Tree):
+            return self._constant(f"k{index}", node)
+
+        if node.data in self.pass_through_rules and len(node.children) == 1:
+            return self.emit(node.children[0])
+
+        if node.data in self.short_circuit_rules and len(node.children) == 2:
+            return self._emit_short_circuit(node, index)
+
+        if node.data in self.reusable_rules:
+            try:
+                return self._evaluated[node]
+            except KeyError:
+                pass
+
+        args = [self.emit(child) for child in node.children]
+        result = self._emit_call(node, index, args)
+        if node.data in self.reusable_rules:
+            self._evaluated[node] = result
+        return result
+
+    def _emit_call(self, node: Tree, index: int, args: list[str]) -> str:
+        """Append the statements calling node's handler with the values named in args."""
+        result = f"v{index}"
+        tree_name = f"t{index}"
+
+        method = getattr(self.transformer_class, node.data, None)
+        wrapper = getattr(method, "visit_wrapper", None)
+
+        if method is None or wrapper not in (None, _INLINE_WRAPPER):
+            # _call_userfunc does its own VisitError wrapping
+            self.namespace[tree_name] = node
+            self.lines.append(
+                f"{result} = transformer._call_userfunc({tree_name}, [{', '.join(args)}])"
+            )
+            return result
+
+        handler = getattr(method, "base_func", method)
+        inline = wrapper is _INLINE_WRAPPER
+
+        if node.data in self.constant_rules and self.constants.issuperset(args):
+            values = [self.namespace[arg] for arg in args]
+            try:
+                value = self._call(handler, inline, values)
+            except Exception:
+                pass  # Raise when the program runs, like any other handler error
+            else:
+                return self._constant(f"c{index}", value)
+
+        handler_name = f"h{index}"
+        self.namespace[handler_name] = handler
+        arg_list = ", ".join(args) if inline else f"[{', '.join(args)}]"
+        call = f"{handler_name}(transformer, {arg_list})"
+
+        operator = getattr(handler, "python_operator", None)
+        if operator is None or not inline or len(args) != 2:
+            self.lines.append(f"{result} = {call}")
+            return result
+
+        symbol, types = operator
+        guards = []
+        for arg in args if types else ():
+            if arg not in self.constants:
+                guards.append(f"type({arg}) in {self._types_name(types)}")
+            elif type(self.namespace[arg]) not in types:
+                # Never takes the operator's path
+                self.lines.append(f"{result} = {call}")
+                return result
+
+        expression = f"{args[0]} {symbol} {args[1]}"
+        if not guards:
+            self.lines.append(f"{result} = {expression}")
+        else:
+            self.lines.extend(
+                [
+                    f"if {' and '.join(guards)}:",
+                    f"    {result} = {expression}",
+                    "else:",
+                    f"    {result} = {call}",
+                ]
+            )
+        return result
+
+    def _types_name(self, types: frozenset) -> str:
+        """The global holding the operand types of a python_operator() guard."""
+        name = self._type_names.get(types)
+        if name is None:
+            name = self._type_names[types] = f"types{len(self._type_names)}"
+            self.namespace[name] = types
+        return name
+
+    def _emit_short_circuit(self, node: Tree, index: int) -> str:
+        """
+        Emit a binary node whose right operand is skipped when bool(left) equals
+        the rule's short-circuit value, which is then the node's value.
+        """
+        decided = self.short_circuit_rules[node.data]
+        left_node, right_node = node.children
+        left = self.emit(left_node)
+
+        if left in self.constants and bool(self.namespace[left]) == decided:
+            return self._constant(f"c{index}", decided)
+
+        # Emit the right operand and the handler call into their own block.
+        # What it evaluates may be skipped, so it can't be reused after it
+        outer_lines, outer_evaluated = self.lines, self._evaluated
+        self.lines, self._evaluated = [], dict(outer_evaluated)
+        right = self.emit(right_node)
+        result = self._emit_call(node, index, [left, right])
+        right_lines, self.lines = self.lines, outer_lines
+        self._evaluated = outer_evaluated
+
+        if left in self.constants:
+            # The left operand never decides, so there is nothing to skip
+            self.lines.extend(right_lines)
+            return result
+
+        self.lines.extend(
+            [
+                f"if {'' if decided else 'not '}{left}:",
+                f"    {result} = {decided!r}",
+                "else:",
+            ]
+        )
+        self.lines.extend(f"    {line}" for line in right_lines)
+        return result
+
+    def _constant(self, name: str, value: Any) -> str:
+        self.namespace[name] = value
+        self.constants.add(name)
+        return name
+
+    def _call(self, handler: Callable, inline: bool, values: list) -> Any:
+        """Call a handler at compile time."""
+        if self._instance is None:
+            self._instance = self.transformer_class()
+        if inline:
+            return handler(self._instance, *values)
+        return handler(self._instance, values)
@@ -1,6 +1,7 @@
-import json
 from datetime import datetime, timezone
 
+from lark import v_args
+
 from .utils import (
     temporal_unit_comparison,
     ensure_datetime,
@@ -12,9 +13,17 @@ from .logconf import get_logger
 log = get_logger(__name__)
 
 
-class DateTimeEncoder(json.JSONEncoder):
-    def default(self, obj):
-        return {"__datetime__": obj.isoformat()}
+def datetime_default(obj):
+    """
+    The default= hook for json.dumps encoding datetimes as {"__datetime__": iso}.
+
+    A plain function keeps json.dumps on its default encoder rather than a
+    JSONEncoder subclass.
+    """
+    isoformat = getattr(obj, "isoformat", None)
+    if isoformat is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return {"__datetime__": isoformat()}
 
 
 class DateMethods:
@@ -22,38 +31,56 @@ class DateMethods:
     Mixin class for add datetime handling methods to ExpressionTransformer
     """
 
-    def date_is_past(self, items: list) -> bool:
+    # The current time, captured on first use so that every date predicate in
+    # one evaluation (one transformer instance) sees the same instant
+    _now_utc: datetime | None = None
+
+    def _now(self, tz=None) -> datetime:
+        """Return the evaluation's current time, in tz if given, otherwise UTC"""
+        now = self._now_utc
+        if now is None:
+            now = self._now_utc = datetime.now(timezone.utc)
+        if tz is None or tz is timezone.utc:
+            return now
+        return now.astimezone(tz)
+
+    @v_args(inline=True)
+    def date_is_past(self, value) -> bool:
         """Handle 'is past' date comparison"""
-        date_obj = ensure_datetime(items[0])
-        now = datetime.now(date_obj.tzinfo if date_obj.tzinfo else timezone.utc)
+        date_obj = ensure_datetime(value)
+        now = self._now(date_obj.tzinfo)
         return date_obj < now
 
-    def date_is_future(self, items: list) -> bool:
+    @v_args(inline=True)
+    def date_is_future(self, value) -> bool:
         """Handle 'is future' date comparison"""
-        date_obj = ensure_datetime(items[0])
-        now = datetime.now(date_obj.tzinfo if date_obj.tzinfo else timezone.utc)
+        date_obj = ensure_datetime(value)
+        now = self._now(date_obj.tzinfo)
         return date_obj > now
 
-    def date_is_today(self, items: list) -> bool:
+    @v_args(inline=True)
+    def date_is_today(self, value) -> bool:
         """Handle 'is today' date comparison"""
-        date_obj = ensure_datetime(items[0])
-        now = datetime.now(date_obj.tzinfo if date_obj.tzinfo else timezone.utc)
+        date_obj = ensure_datetime(value)
+        now = self._now(date_obj.tzinfo)
         return date_obj.date() == now.date()
 
     def now_value(self, _) -> datetime:
         """Return the current datetime for use in comparisons"""
-        return datetime.now(tz=timezone.utc)
+        return self._now()
 
+    @v_args(inline=True)
     @temporal_unit_comparison
     def date_older_than(self, date_obj: datetime, quantity: float, unit: str) -> bool:
         """
         Check if date is older than a specified time period from now.
         """
-        now = datetime.now(date_obj.tzinfo if date_obj.tzinfo else timezone.utc)
+        now = self._now(date_obj.tzinfo)
         delta = create_timedelta(quantity, unit)
 
         return (now - date_obj) > delta
 
+    @v_args(inline=True)
     @temporal_unit_comparison
     def date_upcoming_within(
         self, date_obj: datetime, quantity: float, unit: str
@@ -61,24 +88,27 @@ class DateMethods:
         """
         Check if a date is within a specified time period in the future from now.
         """
-        now = datetime.now(date_obj.tzinfo if date_obj.tzinfo else timezone.utc)
+        now = self._now(date_obj.tzinfo)
         delta = create_timedelta(quantity, unit)
 
         return now <= date_obj <= (now + delta)
 
-    def date_before(self, items: list) -> bool:
+    @v_args(inline=True)
+    def date_before(self, left, right) -> bool:
         """Check if one date is before another"""
-        date1, date2 = unpack_datetimes(items)
+        date1, date2 = unpack_datetimes(left, right)
         return date1 < date2
 
-    def date_after(self, items: list) -> bool:
+    @v_args(inline=True)
+    def date_after(self, left, right) -> bool:
         """Check if one date is after another"""
-        date1, date2 = unpack_datetimes(items)
+        date1, date2 = unpack_datetimes(left, right)
         return date1 > date2
 
-    def date_same_day(self, items: list) -> bool:
+    @v_args(inline=True)
+    def date_same_day(self, left, right) -> bool:
         """Check if two dates are on the same calendar day"""
-        date1, date2 = unpack_datetimes(items)
+        date1, date2 = unpack_datetimes(left, right)
         return date1.date() == date2.date()
 
     # Unit methods
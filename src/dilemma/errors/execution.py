@@ -1,5 +1,3 @@
-from contextlib import contextmanager
-
 from lark.exceptions import VisitError
 
 from .exc import DilemmaError, EvaluationError
@@ -8,12 +6,14 @@ from ..logconf import get_logger
 log = get_logger(__name__)
 
 
-@contextmanager
-def execution_error_handling(expression: str):
+class execution_error_handling:
     """
     Context manager for handling common expression evaluation errors
     with consistent error reporting.
 
+    Entered on every evaluation, so it's a plain class rather than a
+    @contextmanager generator: the success path is just __enter__ and __exit__.
+
     Args:
         expression: The expression being evaluated
 
@@ -21,36 +21,49 @@ def execution_error_handling(expression: str):
         DilemmaError subclasses with templated error messages
     """
 
-    try:
-        yield
-    except DilemmaError as dilemma_error:
-        log.info("Caught early DilemmaError: %s", dilemma_error)
-        # If it's already a DilemmaError, just let it propagate
-        raise dilemma_error
-
-    except VisitError as e:
-        log.info("Caught VisitError %s", e)
-        # Extract the original error from VisitError if possible
-        if isinstance(e.orig_exc, DilemmaError):
-            log.info("Original Error was DilemmaError, re-raising. msg: %s", e)
-            raise e.orig_exc
-
-        log.info("Wrapping VisitError in EvaluationError. msg       : %s", e)
-        # Otherwise wrap it in EvaluationError
-        raise EvaluationError(
-            template_key="evaluation_error",
-            expression=expression,
-            error_type="VisitError",
-            details=str(e),
-        ) from e
-
-    except Exception as err:
-        log.warning("Caught Not VisitError: %s", err)
-
-        errtype = str(type(err))
-        raise EvaluationError(
-            template_key="evaluation_error",
-            expression=expression,
-            error_type=errtype,
-            details=str(err),
-        ) from err
+    __slots__ = ("expression",)
+
+    def __init__(self, expression: str):
+        self.expression = expression
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            return False
+
+        if isinstance(exc, DilemmaError):
+            log.debug("Caught early DilemmaError: %s", exc)
+            # If it's already a DilemmaError, just let it propagate
+            return False
+
+        if isinstance(exc, VisitError):
+            log.debug("Caught VisitError %s", exc)
+            # Extract the original error from VisitError if possible
+            if isinstance(exc.orig_exc, DilemmaError):
+                log.debug("Original Error was DilemmaError, re-raising. msg: %s", exc)
+                raise exc.orig_exc
+
+            log.debug("Wrapping VisitError in EvaluationError. msg       : %s", exc)
+            # Otherwise wrap it in EvaluationError
+            raise EvaluationError(
+                template_key="evaluation_error",
+                expression=self.expression,
+                error_type="VisitError",
+                details=str(exc),
+            ) from exc
+
+        if isinstance(exc, Exception):
+            log.debug("Caught Not VisitError: %s", exc)
+
+            errtype = str(type(exc))
+            raise EvaluationError(
+                template_key="evaluation_error",
+                expression=self.expression,
+                error_type=errtype,
+                details=str(exc),
+            ) from exc
+
+        # KeyboardInterrupt and the like
+        return False
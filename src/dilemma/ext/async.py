@@ -4,72 +4,167 @@ asynchronously, fetching data from url and evaluating them within the same
 expression.
 """
 
+import asyncio
 from datetime import datetime
-from contextvars import ContextVar
-import traceback
 
-from lark import Lark, Tree
+from lark import Tree
 
-from ..lang import ExpressionTransformer, CompiledExpression, _process_variables, grammar
+from ..compiled import _INLINE_WRAPPER
+from ..lang import (
+    ExpressionTransformer,
+    CompiledExpression,
+    _parse,
+    _parse_cached,
+    _process_variables,
+)
 from ..errors import parsing_error_handling, execution_error_handling, VariableError
 from ..logconf import get_logger
 from ..resolvers.interface import ResolverSpec
 
 log = get_logger(__name__)
 
+# How _resolve_handler() says a rule's handler is to be called
+_ASYNC, _INLINE, _LIST, _DISPATCH = range(4)
 
-_context_var: ContextVar[Lark] = ContextVar("_context_var")
-
-
-def build_parser() -> Lark:
-    """
-    Returns a context-var local instance of the Lark parser.
-    """
-    if not _context_var.get(False):
-        log.info("Building parser from grammar and assigning to thread local")
-        _context_var.set(Lark(grammar, start="expr", parser="lalr"))
-    return _context_var.get()
+# Walk state of a short-circuiting node whose left operand has been evaluated
+_LEFT_DONE = object()
 
 
 class AsyncExpressionTransformer(ExpressionTransformer):
     """Asynchronous version of ExpressionTransformer."""
 
+    def reset(self, processed_json: dict | None = None) -> None:
+        super().reset(processed_json)
+        # Results of backticked expressions, by expression, for this evaluation
+        self._resolved: dict = {}
+
     async def transform_async(self, tree):
-        """Transform a parse tree asynchronously."""
-        # Get the tree's data which is the name of the rule
-        rule = tree.data
-
-        # If we have a specific async handler for this rule, use it
-        if hasattr(self, f"{rule}_async"):
-            children = [
-                await self.transform_async(child) if isinstance(child, Tree) else child
-                for child in tree.children
-            ]
-            handler = getattr(self, f"{rule}_async")
-            return await handler(children)
-
-        # Otherwise, fall back to the sync handler but handle async children
-        children = []
-        for child in tree.children:
-            if isinstance(child, Tree):
-                child_result = await self.transform_async(child)
+        """
+        Transform a parse tree asynchronously.
+
+        The tree is walked in post-order with an explicit stack rather than by
+        recursion. Rules with a `<rule>_async` handler are awaited; all others
+        go through the sync handler. As in compiled programs, the right operand
+        of a SHORT_CIRCUIT_RULES node is skipped when the left one decides;
+        its backticked expressions are only prefetched once it is known to run.
+        """
+        await self._prefetch(tree)
+
+        handlers = _dispatch_tables.setdefault(type(self), {})
+        short_circuit = self.SHORT_CIRCUIT_RULES
+        values: list = []
+        stack = [(tree, False)]
+
+        while stack:
+            node, visited = stack.pop()
+            if not isinstance(node, Tree):
+                values.append(node)
+                continue
+            if not visited:
+                if node.data in short_circuit and len(node.children) == 2:
+                    # Decide whether to evaluate the right operand once the
+                    # left one's value is on the values stack
+                    stack.append((node, _LEFT_DONE))
+                    stack.append((node.children[0], False))
+                    continue
+                # Revisit once the children's values are on the values stack
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+                continue
+            if visited is _LEFT_DONE:
+                decided = short_circuit[node.data]
+                if bool(values[-1]) == decided:
+                    values[-1] = decided
+                else:
+                    await self._prefetch(node.children[1])
+                    stack.append((node, True))
+                    stack.append((node.children[1], False))
+                continue
+
+            start = len(values) - len(node.children)
+            children = values[start:]
+            del values[start:]
+
+            rule = node.data
+            try:
+                kind, handler = handlers[rule]
+            except KeyError:
+                kind, handler = handlers[rule] = _resolve_handler(type(self), rule)
+
+            if kind is _INLINE:
+                values.append(handler(self, *children))
+            elif kind is _LIST:
+                values.append(handler(self, children))
+            elif kind is _ASYNC:
+                values.append(await handler(self, children))
             else:
-                child_result = child
-            children.append(child_result)
+                # Let Lark apply any other v_args calling convention
+                values.append(self._call_userfunc(node, children))
+
+        return values[0]
 
-        # Call the sync handler with the processed children
-        handler = getattr(self, rule)
-        return handler(children)
+    async def _prefetch(self, tree):
+        """
+        Resolve the backticked expressions evaluating tree will reach concurrently.
+
+        The right operands of SHORT_CIRCUIT_RULES nodes are left out, as they may
+        be skipped; transform_async prefetches each one when it is about to be
+        evaluated. The walk then finds the values in self._resolved instead of
+        awaiting them one after another.
+        """
+        from ..resolvers import resolve_path_async
+
+        short_circuit = self.SHORT_CIRCUIT_RULES
+        raw_exprs = set()
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, Tree):
+                continue
+            if node.data == "resolver_expression":
+                raw_exprs.add(node.children[0].value[1:-1])
+            elif node.data in short_circuit and len(node.children) == 2:
+                stack.append(node.children[0])
+            else:
+                stack.extend(node.children)
+
+        raw_exprs.difference_update(self._resolved)
+        if not raw_exprs:
+            return
+
+        raw_exprs = list(raw_exprs)
+        # Failures are kept rather than raised, so that the error reported is
+        # that of the first expression evaluation reaches
+        values = await asyncio.gather(
+            *(
+                resolve_path_async(raw_expr, self.processed_json, raw=True)
+                for raw_expr in raw_exprs
+            ),
+            return_exceptions=True,
+        )
+        for value in values:
+            if isinstance(value, asyncio.CancelledError):
+                # Cancellation isn't a resolver failure to report later
+                raise value
+        self._resolved.update(zip(raw_exprs, values))
 
     async def resolver_expression_async(self, items):
         """Process a backticked expression asynchronously."""
         # Extract the expression from the token
         raw_expr = items[0].value[1:-1]  # Remove backticks
 
-        # Use the async resolver system
-        from ..resolvers import resolve_path_async
+        # The same expression appearing twice is only fetched once
+        if raw_expr in self._resolved:
+            value = self._resolved[raw_expr]
+        else:
+            # Use the async resolver system
+            from ..resolvers import resolve_path_async
 
-        value = await resolve_path_async(raw_expr, self.processed_json, raw=True)
+            value = await resolve_path_async(raw_expr, self.processed_json, raw=True)
+            self._resolved[raw_expr] = value
+        if isinstance(value, BaseException):
+            # Failed while prefetching
+            raise value
 
         # Handle datetime reconstruction
         if isinstance(value, dict) and "__datetime__" in value:
@@ -78,13 +173,31 @@ class AsyncExpressionTransformer(ExpressionTransformer):
         return value
 
 
+# Transformer class -> {rule: (kind, unbound handler)}, filled in as rules are seen
+_dispatch_tables: dict[type, dict] = {}
+
+
+def _resolve_handler(transformer_class: type, rule: str) -> tuple:
+    """Look up how rule is handled by transformer_class, once per class and rule."""
+    async_handler = getattr(transformer_class, f"{rule}_async", None)
+    if async_handler is not None:
+        return _ASYNC, async_handler
+
+    method = getattr(transformer_class, rule, None)
+    wrapper = getattr(method, "visit_wrapper", None)
+    if method is None or wrapper not in (None, _INLINE_WRAPPER):
+        return _DISPATCH, None
+    if wrapper is _INLINE_WRAPPER:
+        return _INLINE, method.base_func
+    return _LIST, method
+
+
 async def evaluate_async(expression, variables=None):
     """Asynchronous version of evaluate()."""
     processed_json = _process_variables(variables)
-    parser = build_parser()
 
-    with parsing_error_handling(expression, parser.parse):
-        tree = parser.parse(expression)
+    with parsing_error_handling(expression, _parse):
+        tree = _parse_cached(expression)
 
     with execution_error_handling(expression):
         transformer = AsyncExpressionTransformer(processed_json=processed_json)
@@ -94,6 +207,8 @@ async def evaluate_async(expression, variables=None):
 class AsyncCompiledExpression(CompiledExpression):
     """Async version of CompiledExpression."""
 
+    __slots__ = ()
+
     async def evaluate_async(self, variables=None):
         """Evaluate this compiled expression asynchronously."""
         processed_json = _process_variables(variables)
@@ -105,9 +220,8 @@ class AsyncCompiledExpression(CompiledExpression):
 
 async def compile_expression_async(expression):
     """Compile an expression for async evaluation."""
-    parser = build_parser()
-    with parsing_error_handling(expression, parser.parse):
-        tree = parser.parse(expression)
+    with parsing_error_handling(expression, _parse):
+        tree = _parse_cached(expression)
         return AsyncCompiledExpression(expression, tree)
 
 
@@ -141,8 +255,9 @@ class AsyncResolverSpec(ResolverSpec):
         except VariableError:
             raise
         except Exception as e:
-            self.logger.warning(f"Error resolving '{original_path}': {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            # Reported to the caller as a VariableError; the traceback is only
+            # formatted if debug logging is on
+            self.logger.debug("Error resolving '%s': %s", original_path, e, exc_info=True)
 
             raise VariableError(
                 template_key="unresolved_path",
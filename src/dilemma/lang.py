@@ -2,13 +2,19 @@
 Expression language implementation using Lark
 """
 
+import copy
 import json
+import os
+import stat
+import sys
 import threading
 import fnmatch
+from collections import OrderedDict
 from datetime import datetime
-from typing import Union
+from functools import lru_cache
+from typing import Iterable, Union
 
-from lark import Token, v_args
+from lark import Token, Tree, v_args
 from lark import Lark, Transformer
 
 from .errors import (
@@ -19,7 +25,8 @@ from .errors import (
     DilemmaError,
 )
 
-from .dates import DateMethods, DateTimeEncoder
+from .compiled import compile_tree, python_operator
+from .dates import DateMethods, datetime_default
 from .logconf import get_logger
 from .resolvers import resolve_path
 from .utils import (
@@ -139,27 +146,115 @@ grammar = r"""
 
 MAX_STRING_LENGTH = 10000  # Define a reasonable maximum length
 
+# Floats closer together than this compare equal
+FLOAT_EPSILON = 1e-10
+
+
+# Operand types for which the arithmetic handlers are plain Python arithmetic
+_NUMBER_TYPES = (int, float)
+
+
+# Operand types for which _equal is plain ==: anything but float
+_EXACT_EQUALITY_TYPES = (int, bool, str, type(None), list, dict, datetime)
+
+
+def _equal(left, right) -> bool:
+    """Equality as used by == and !=: floats are compared within FLOAT_EPSILON"""
+    # Exact type checks: cheaper than isinstance, and context values are plain
+    # JSON types so float subclasses don't occur
+    if type(left) is float or type(right) is float:
+        return -FLOAT_EPSILON < left - right < FLOAT_EPSILON
+    return left == right
+
 
 # Transformer to evaluate expressions
 class ExpressionTransformer(Transformer, DateMethods, ArrayMethods):
     # Epsilon value for float comparison
-    EPSILON = 1e-10
+    EPSILON = FLOAT_EPSILON
+
+    # Rules whose value depends only on their children. When the children are
+    # constants (literals, or other folded nodes) the node is evaluated once, when
+    # the expression is compiled
+    CONSTANT_RULES = frozenset(
+        {
+            # Literals
+            "int_number",
+            "float_number",
+            "negative_int",
+            "negative_float",
+            "true_value",
+            "false_value",
+            "string_literal",
+            # Operators
+            "add",
+            "sub",
+            "mul",
+            "div",
+            "paren",
+            "eq",
+            "ne",
+            "lt",
+            "gt",
+            "le",
+            "ge",
+            "and_op",
+            "or_op",
+            "contains",
+            "contained_in",
+            "has_property",
+            "pattern_match",
+            "pattern_not_match",
+            "is_empty",
+            "date_before",
+            "date_after",
+            "date_same_day",
+            # Time units
+            "minute_unit",
+            "hour_unit",
+            "day_unit",
+            "week_unit",
+            "month_unit",
+            "year_unit",
+        }
+    )
+
+    # Logical operators, with the value that decides the result when the left
+    # operand has it: the right operand is then never evaluated, so its variables
+    # needn't exist
+    SHORT_CIRCUIT_RULES = {"and_op": False, "or_op": True}
+
+    # Rules that evaluate to their only child. They stay in the grammar because
+    # other transformers (humanise) render them, but compiled programs skip them
+    PASS_THROUGH_RULES = frozenset({"paren"})
+
+    # Rules with the same value wherever the same node occurs in one evaluation:
+    # "x > 1 and x < 5" looks x up once
+    REUSABLE_RULES = frozenset({"variable", "resolver_expression"})
 
     def __init__(self, processed_json: dict | None = None):
         super().__init__()
+        self.reset(processed_json)
+
+    def reset(self, processed_json: dict | None = None) -> None:
+        """Prepare the transformer for a new evaluation against processed_json."""
         self.processed_json = processed_json or {}
+        self._now_utc = None
 
-    def int_number(self, items: list[Token]) -> int:
-        return int(items[0])
+    @v_args(inline=True)
+    def int_number(self, token: Token) -> int:
+        return int(token)
 
-    def float_number(self, items: list[Token]) -> float:
-        return float(items[0])
+    @v_args(inline=True)
+    def float_number(self, token: Token) -> float:
+        return float(token)
 
-    def negative_int(self, items: list[Token]) -> int:
-        return -int(items[0])
+    @v_args(inline=True)
+    def negative_int(self, token: Token) -> int:
+        return -int(token)
 
-    def negative_float(self, items: list[Token]) -> float:
-        return -float(items[0])
+    @v_args(inline=True)
+    def negative_float(self, token: Token) -> float:
+        return -float(token)
 
     def true_value(self, _) -> bool:
         return True
@@ -167,10 +262,9 @@ class ExpressionTransformer(Transformer, DateMethods, ArrayMethods):
     def false_value(self, _) -> bool:
         return False
 
-    def variable(
-        self, items: list[Token]
-    ) -> int | float | bool | str | list | dict | datetime:
-        var_path = items[0].value
+    @v_args(inline=True)
+    def variable(self, token: Token) -> int | float | bool | str | list | dict | datetime:
+        var_path = token.value
 
         value = resolve_path(var_path, self.processed_json, raw=False)
 
@@ -181,6 +275,7 @@ class ExpressionTransformer(Transformer, DateMethods, ArrayMethods):
         return value
 
     @v_args(inline=True)
+    @python_operator("+", _NUMBER_TYPES)
     def add(self, left, right):
         """Addition operator (+) - allows string concatenation with limits"""
         # Allow string concatenation only when both operands are strings
@@ -200,12 +295,14 @@ class ExpressionTransformer(Transformer, DateMethods, ArrayMethods):
         return left + right
 
     @v_args(inline=True)
+    @python_operator("-", _NUMBER_TYPES)
     def sub(self, left, right):
         """Subtraction operator (-) - deny for strings"""
         reject_strings(left, right, "-")
         return left - right
 
     @v_args(inline=True)
+    @python_operator("*", _NUMBER_TYPES)
     def mul(self, left, right):
         """Multiplication operator (*) - deny for strings"""
         reject_strings(left, right, "*")
@@ -219,43 +316,52 @@ class ExpressionTransformer(Transformer, DateMethods, ArrayMethods):
             raise DilemmaError(template_key="zero_division", left=left, right=right)
         return left / right  # Now using true division
 
-    def paren(self, items: list) -> float:
+    @v_args(inline=True)
+    def paren(self, value):
         """Handle parenthesized expressions by returning the inner value"""
-        return items[0]
+        return value
 
-    def string_literal(self, items: list[Token]) -> str:
+    @v_args(inline=True)
+    def string_literal(self, token: Token) -> str:
         # Remove surrounding quotes and unescape
-        return items[0][1:-1].encode("utf-8").decode("unicode_escape")
+        text = token[1:-1]
+        if "\\" not in text:
+            # Nothing to unescape
+            return text
+        # unicode_escape reads bytes as latin-1; encoding other characters as
+        # \u escapes keeps non-ASCII text intact through the decode
+        return text.encode("latin-1", "backslashreplace").decode("unicode_escape")
 
     # Comparison operations
     @v_args(inline=True)
+    @python_operator("==", _EXACT_EQUALITY_TYPES)
     def eq(self, left, right) -> bool:
         """Check if two items are equal, with special handling for different types"""
-
-        # float is special case
-        if isinstance(left, float) or isinstance(right, float):
-            return abs(left - right) < self.EPSILON
-
-        return left == right
+        return _equal(left, right)
 
     @v_args(inline=True)
+    @python_operator("!=", _EXACT_EQUALITY_TYPES)
     def ne(self, left, right) -> bool:
         """Check if two items are not equal, with special handling for float comparison"""
-        return not self.eq(left, right)
+        return not _equal(left, right)
 
     @v_args(inline=True)
+    @python_operator("<")
     def lt(self, left, right) -> bool:
         return left < right
 
     @v_args(inline=True)
+    @python_operator(">")
     def gt(self, left, right) -> bool:
         return left > right
 
     @v_args(inline=True)
+    @python_operator("<=")
     def le(self, left, right) -> bool:
         return left <= right
 
     @v_args(inline=True)
+    @python_operator(">=")
     def ge(self, left, right) -> bool:
         return left >= right
 
@@ -329,20 +435,21 @@ class ExpressionTransformer(Transformer, DateMethods, ArrayMethods):
 
         return not self.pattern_match(left, right)
 
-    def is_empty(self, items: list) -> bool:
+    @v_args(inline=True)
+    def is_empty(self, value) -> bool:
         """Check if a container (list or dict) is empty."""
-        value = items[0]
         if isinstance(value, (list, tuple, dict)):
             return len(value) == 0
         else:
             raise ContainerError(template_key="wrong_container", operation="is $empty")
 
+    @v_args(inline=True)
     def resolver_expression(
-        self, items: list[Token]
+        self, token: Token
     ) -> int | float | bool | str | list | dict | datetime:
         """Process a backticked expression using the configured resolver"""
         # Extract the expression from the token: `expression` -> expression
-        raw_expr = items[0].value[1:-1]  # Remove ` prefix and ` suffix
+        raw_expr = token.value[1:-1]  # Remove ` prefix and ` suffix
 
         # Use the resolver system to evaluate with raw=True
         value = resolve_path(raw_expr, self.processed_json, raw=True)
@@ -354,50 +461,148 @@ class ExpressionTransformer(Transformer, DateMethods, ArrayMethods):
         return value
 
     # Array quantified sugar methods
-    def at_least_of(self, items):
+    @v_args(inline=True)
+    def at_least_of(self, n, coll, pred):
         """Transform 'at least N of X has P' to count_of(X, P) >= N"""
-        n, coll, pred = int(items[0]), items[1], items[2]
-        return self.func_call([Token("FUNC_NAME", "count_of"), coll, pred]) >= n
+        return self.func_call([Token("FUNC_NAME", "count_of"), coll, pred]) >= int(n)
 
-    def at_most_of(self, items):
+    @v_args(inline=True)
+    def at_most_of(self, n, coll, pred):
         """Transform 'at most N of X has P' to count_of(X, P) <= N"""
-        n, coll, pred = int(items[0]), items[1], items[2]
-        return self.func_call([Token("FUNC_NAME", "count_of"), coll, pred]) <= n
+        return self.func_call([Token("FUNC_NAME", "count_of"), coll, pred]) <= int(n)
 
-    def exactly_of(self, items):
+    @v_args(inline=True)
+    def exactly_of(self, n, coll, pred):
         """Transform 'exactly N of X has P' to count_of(X, P) == N"""
-        n, coll, pred = int(items[0]), items[1], items[2]
-        return self.func_call([Token("FUNC_NAME", "count_of"), coll, pred]) == n
+        return self.func_call([Token("FUNC_NAME", "count_of"), coll, pred]) == int(n)
 
-    def any_of_sugar(self, items):
+    @v_args(inline=True)
+    def any_of_sugar(self, coll, pred):
         """Transform 'any of X has P' to any_of(X, P)"""
-        coll, pred = items[0], items[1]
         return self.func_call([Token("FUNC_NAME", "any_of"), coll, pred])
 
-    def all_of_sugar(self, items):
+    @v_args(inline=True)
+    def all_of_sugar(self, coll, pred):
         """Transform 'all of X has P' to all_of(X, P)"""
-        coll, pred = items[0], items[1]
         return self.func_call([Token("FUNC_NAME", "all_of"), coll, pred])
 
-    def none_of_sugar(self, items):
+    @v_args(inline=True)
+    def none_of_sugar(self, coll, pred):
         """Transform 'none of X has P' to none_of(X, P)"""
-        coll, pred = items[0], items[1]
         return self.func_call([Token("FUNC_NAME", "none_of"), coll, pred])
 
 
-# Thread-local storage for the parser
-_thread_local = threading.local()
+def grammar_cache_path() -> str | bool:
+    """
+    Where Lark caches the analysed grammar, as its cache option.
+
+    Lark unpickles the cache file, so it is only kept in a directory that nobody
+    else can write to: dilemma/ under the user's cache directory ($XDG_CACHE_HOME
+    or ~/.cache), created with mode 0o700. Returns False, disabling the cache, if
+    that directory can't be created or is a symlink, owned by another user or
+    accessible to group or others.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    directory = os.path.join(base, "dilemma")
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+    except OSError:
+        return False
+
+    if not stat.S_ISDIR(info.st_mode) or info.st_mode & 0o077:
+        return False
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    # Lark checks a hash of the grammar and options stored in the file itself
+    major, minor = sys.version_info[:2]
+    return os.path.join(directory, f"grammar-py{major}.{minor}.cache")
+
+
+# One parser for the whole process. Parsing keeps its state per call, so a Lark
+# LALR parser can be shared between threads; only transformers hold evaluation state.
+# The analysed grammar is cached on disk so later processes load the parse tables
+# instead of rebuilding them.
+_parser = Lark(grammar, start="expr", parser="lalr", cache=grammar_cache_path())
 
 
 def build_parser() -> Lark:
     """
-    Returns a thread-local instance of the Lark parser.
-    Ensures thread safety by creating a separate parser for each thread.
+    Returns the shared instance of the Lark parser.
+    """
+    return _parser
+
+
+def _parse(expression: str) -> Tree:
     """
-    if not hasattr(_thread_local, "parser"):
-        log.info("Building parser from grammar and assigning to thread local")
-        _thread_local.parser = Lark(grammar, start="expr", parser="lalr")
-    return _thread_local.parser
+    Parse an expression with the shared parser.
+
+    Passed to parsing_error_handling, which only calls it when reporting an
+    error, so the successful path doesn't have to look the parser up at all.
+    """
+    return build_parser().parse(expression)
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(expression: str) -> Tree:
+    """
+    Parse an expression, memoizing the resulting tree by expression text.
+
+    Parse trees are treated as immutable - transformers build new values rather
+    than modifying the tree - so a cached tree can be shared between evaluations.
+    Parse failures raise and are therefore never cached.
+    """
+    return _parse(expression)
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(expression: str) -> "CompiledExpression":
+    """Parse and compile an expression, memoizing the result by expression text."""
+    return CompiledExpression(expression, _parse_cached(expression))
+
+
+# Idle transformers, per thread. Evaluations can nest on one thread (array
+# predicates evaluate sub-expressions) so this is a free list, not one instance.
+_transformer_pool = threading.local()
+
+
+def _free_transformers() -> list:
+    """This thread's idle transformers."""
+    try:
+        return _transformer_pool.free
+    except AttributeError:
+        free = _transformer_pool.free = []
+        return free
+
+
+def _run(program, processed_json: dict):
+    """Run a compiled program with a pooled ExpressionTransformer."""
+    free = _free_transformers()
+    transformer = free.pop() if free else ExpressionTransformer()
+    transformer.reset(processed_json)
+    try:
+        return program(transformer)
+    finally:
+        # Don't keep the context alive while the transformer is idle
+        transformer.reset(None)
+        free.append(transformer)
+
+
+def _run_each(program, processed_jsons: list[dict]) -> list:
+    """Run a compiled program against each context with one pooled transformer."""
+    free = _free_transformers()
+    transformer = free.pop() if free else ExpressionTransformer()
+    try:
+        results = []
+        for processed_json in processed_jsons:
+            transformer.reset(processed_json)
+            results.append(program(transformer))
+        return results
+    finally:
+        transformer.reset(None)
+        free.append(transformer)
 
 
 class CompiledExpression:
@@ -406,9 +611,13 @@ class CompiledExpression:
     with different variable contexts for improved performance.
     """
 
+    # Compiled expressions are cached and can be numerous; no per-instance dict
+    __slots__ = ("expression", "parse_tree", "program")
+
     def __init__(self, expression: str, parse_tree):
         self.expression = expression
         self.parse_tree = parse_tree
+        self.program = compile_tree(parse_tree, ExpressionTransformer)
 
     def evaluate(
         self, context: Union[dict, str, "ProcessedContext", None] = None
@@ -423,10 +632,34 @@ class CompiledExpression:
             The result of evaluating the expression
         """
         processed_json = _extract_processed_json(context)
+        if self.program.constant:
+            # Folded when compiled, e.g. "2 * (3 + 4)": no transformer needed
+            return self.program(None)
+
+        with execution_error_handling(self.expression):
+            return _run(self.program, processed_json)
+
+    def evaluate_batch(
+        self, contexts: Iterable[Union[dict, str, "ProcessedContext", None]]
+    ) -> list[Union[int, float, bool, str]]:
+        """
+        Evaluate this compiled expression against each of several contexts.
+
+        Equivalent to [self.evaluate(context) for context in contexts], but the
+        transformer and error handling are set up once for the whole batch.
+
+        Args:
+            contexts: Dictionaries, JSON strings, or ProcessedContexts
+
+        Returns:
+            The results, in the order of contexts
+        """
+        processed_jsons = [_extract_processed_json(context) for context in contexts]
+        if self.program.constant:
+            return [self.program(None)] * len(processed_jsons)
 
         with execution_error_handling(self.expression):
-            transformer = ExpressionTransformer(processed_json=processed_json)
-            return transformer.transform(self.parse_tree)
+            return _run_each(self.program, processed_jsons)
 
 
 class ProcessedContext:
@@ -434,7 +667,7 @@ class ProcessedContext:
     Represents a pre-processed variable context that can be reused across multiple
     expression evaluations for improved performance.
 
-    This class encapsulates the JSON round-trip safety processing, allowing you to
+    This class encapsulates the JSON-compatible safety processing, allowing you to
     process variables once and reuse the safe representation multiple times.
     """
 
@@ -474,12 +707,38 @@ def _process_variables(variables: dict | str | None = None) -> dict:
                 processed_json = json.loads(variables)
             else:
                 # Convert dictionary to JSON-compatible structure
-                processed_json = json.loads(json.dumps(variables, cls=DateTimeEncoder))
+                processed_json = _to_json_compatible(variables)
         except (TypeError, json.JSONDecodeError) as e:
             raise DilemmaError(template_key="variables_processing", details=str(e))
     return processed_json
 
 
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _to_json_compatible(value):
+    """
+    Return a copy of value as json.loads(json.dumps(value, default=datetime_default))
+    would, without serializing it.
+
+    Plain dicts with string keys, lists, tuples, JSON scalars and datetimes are
+    converted directly. Anything else (dicts with other keys, subclasses) is
+    rare enough to go through the JSON round trip, which defines the result.
+    """
+    value_type = type(value)
+    if value_type in _JSON_SCALARS:
+        return value
+    if value_type is datetime:
+        # As encoded by datetime_default
+        return {"__datetime__": value.isoformat()}
+    if value_type is dict:
+        if all(type(key) is str for key in value):
+            return {key: _to_json_compatible(item) for key, item in value.items()}
+    elif value_type is list or value_type is tuple:
+        return [_to_json_compatible(item) for item in value]
+    return json.loads(json.dumps(value, default=datetime_default))
+
+
 def _extract_processed_json(
     context: Union[dict, str, "ProcessedContext", None] = None,
 ) -> dict:
@@ -512,16 +771,14 @@ def compile_expression(expression: str) -> CompiledExpression:
     Raises:
         ValueError: If the expression has invalid syntax
     """
-    parser = build_parser()
-    with parsing_error_handling(expression, parser.parse):
-        tree = parser.parse(expression)
-        return CompiledExpression(expression, tree)
+    with parsing_error_handling(expression, _parse):
+        return _compile_cached(expression)
 
 
 # Function to evaluate expressions
 def evaluate(
     expression: str, context: Union[dict, str, "ProcessedContext", None] = None
-) -> Union[int, float, bool, str]:
+) -> Union[int, float, bool, str, list, dict]:
     """
     Evaluate an expression against the given context.
 
@@ -534,11 +791,141 @@ def evaluate(
     """
 
     processed_json = _extract_processed_json(context)
-    parser = build_parser()
 
-    with parsing_error_handling(expression, parser.parse):
-        tree = parser.parse(expression)
+    with parsing_error_handling(expression, _parse):
+        compiled = _compile_cached(expression)
+    if compiled.program.constant:
+        return compiled.program(None)
 
     with execution_error_handling(expression):
-        transformer = ExpressionTransformer(processed_json=processed_json)
-        return transformer.transform(tree)
+        return _run(compiled.program, processed_json)
+
+
+# Parse tree rules whose result depends on the current time rather than the context
+_IMPURE_RULES = frozenset(
+    {
+        "now_value",
+        "date_is_past",
+        "date_is_future",
+        "date_is_today",
+        "date_upcoming_within",
+        "date_older_than",
+        # Backticked expressions go to the resolver, which may depend on anything
+        "resolver_expression",
+    }
+)
+
+# Rules whose predicate token holds an expression evaluated against each item
+_PREDICATE_RULES = frozenset(
+    {
+        "func_call",
+        "at_least_of",
+        "at_most_of",
+        "exactly_of",
+        "any_of_sugar",
+        "all_of_sugar",
+        "none_of_sugar",
+    }
+)
+
+RESULT_CACHE_SIZE = 4096
+
+_result_cache: OrderedDict = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def _is_pure(expression: str) -> bool:
+    """Return True if the expression's result depends only on its context."""
+    tree = _parse_cached(expression)
+    for sub in tree.iter_subtrees():
+        if sub.data in _IMPURE_RULES:
+            return False
+        if sub.data in _PREDICATE_RULES:
+            for child in sub.children:
+                if isinstance(child, Token) and child.type in (
+                    "RESOLVER_EXPR",
+                    "ARRAY_EXPR",
+                ):
+                    # The predicate's delimiters are stripped before evaluation
+                    if not _is_pure(child.value[1:-1]):
+                        return False
+    return True
+
+
+def _freeze(value):
+    """
+    Convert a variables structure into a hashable cache key.
+
+    Scalars are tagged with their type so that, for example, 1, 1.0 and True
+    produce distinct keys, and datetimes keep their timezone. Raises TypeError for values that cannot be hashed.
+    """
+    if isinstance(value, ProcessedContext):
+        return ("ctx", _freeze(value.get_processed_json()))
+    if isinstance(value, dict):
+        return ("dict", frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(_freeze(v) for v in value))
+    if isinstance(value, datetime):
+        # Equal instants in different timezones evaluate differently; keep the
+        # offset, as the isoformat() the context is converted to does
+        return (datetime, value.isoformat())
+    hash(value)
+    return (type(value), value)
+
+
+def evaluate_cached(
+    expression: str, context: Union[dict, str, "ProcessedContext", None] = None
+) -> Union[int, float, bool, str, list, dict]:
+    """
+    Evaluate an expression, memoizing the result by expression and context.
+
+    Repeated calls with an equal expression and context return the stored result
+    instead of re-evaluating. Expressions that depend on the current time ($now,
+    is $past, older than, ...), including inside array predicates, expressions
+    with backticked resolver queries and contexts containing unhashable values
+    are always evaluated afresh.
+
+    Args:
+        expression: The expression string to evaluate
+        context: Dictionary, JSON string, or ProcessedContext containing variable values
+    """
+    try:
+        pure = _is_pure(expression)
+    except Exception:
+        # Let evaluate() report the syntax error
+        pure = False
+
+    key = None
+    if pure:
+        try:
+            key = (expression, _freeze(context))
+        except TypeError:
+            key = None
+
+    if key is None:
+        return evaluate(expression, context)
+
+    with _result_cache_lock:
+        if key in _result_cache:
+            _result_cache.move_to_end(key)
+            result = _result_cache[key]
+            return copy.deepcopy(result) if isinstance(result, (list, dict)) else result
+
+    result = evaluate(expression, context)
+
+    with _result_cache_lock:
+        _result_cache[key] = result
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+    return copy.deepcopy(result) if isinstance(result, (list, dict)) else result
+
+
+def clear_caches() -> None:
+    """Discard all cached parse trees and memoized evaluation results."""
+    _parse_cached.cache_clear()
+    _compile_cached.cache_clear()
+    _is_pure.cache_clear()
+    with _result_cache_lock:
+        _result_cache.clear()
@@ -62,8 +62,9 @@ async def resolve_path_async(path, context, resolver_name=None, raw=False):
     resolver = _resolvers[res_name]
 
     # Check if resolver supports async operations
-    if hasattr(resolver, "resolve_path_async"):  # pragma: no cover
-        return await resolver.resolve_path_async(path, context, raw=raw)
+    resolve_async = getattr(resolver, "resolve_path_async", None)
+    if resolve_async is not None:  # pragma: no cover
+        return await resolve_async(path, context, raw=raw)
     else:
         # Fall back to sync version for backward compatibility
         return resolver.resolve_path(path, context, raw=raw)
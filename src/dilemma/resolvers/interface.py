@@ -1,15 +1,80 @@
 """Interface for variable resolvers in dilemma."""
 
-import traceback
+import re
+from functools import lru_cache
+
 from ..errors import VariableError
 from ..logconf import get_logger
 
+# Returned by _execute_query when the path is absent from the context, so that a
+# missing variable doesn't have to be signalled by raising and catching an exception
+MISSING = object()
+
+# Returned by walk_path_steps when a step meets a value of the wrong type, leaving
+# the path to the resolver's own query language (and its errors)
+NOT_WALKED = object()
+
+# The possessive in "user's name", converted to a dot
+_POSSESSIVE = re.compile(r"'s\s+")
+
+# One step of a plain variable path: a name (dot separated after the first) or
+# a list index
+_PATH_STEP = re.compile(r"(?:^|\.)([a-zA-Z_][a-zA-Z0-9_]*)|\[(\d+)\]")
+
+
+@lru_cache(maxsize=1024)
+def path_steps(path: str) -> tuple | None:
+    """
+    Split a variable path such as "user.orders[0].total" into its steps:
+    names as str and list indexes as int.
+
+    Returns None for paths that aren't just names and indexes.
+    """
+    steps = []
+    pos = 0
+    while pos < len(path):
+        match = _PATH_STEP.match(path, pos)
+        if match is None:
+            return None
+        name, index = match.groups()
+        steps.append(name if index is None else int(index))
+        pos = match.end()
+    return tuple(steps) or None
+
+
+def walk_path_steps(steps: tuple, context):
+    """
+    Follow the steps of a path through nested dicts and lists directly.
+
+    Returns MISSING for a name that isn't in its dict, None for an index past the
+    end of its list, and NOT_WALKED when a name meets something other than a
+    dict or an index something other than a list.
+    """
+    value = context
+    for step in steps:
+        if type(step) is str:
+            if not isinstance(value, dict):
+                return NOT_WALKED
+            value = value.get(step, MISSING)
+            if value is MISSING:
+                return MISSING
+        else:
+            if not isinstance(value, list):
+                return NOT_WALKED
+            if step >= len(value):
+                return None
+            value = value[step]
+    return value
+
 
 class ResolverSpec:
     """Base class for variable resolvers."""
 
     def __init__(self):
         self.logger = get_logger(f"resolvers.{self.__class__.__name__.lower()}")
+        # Variable paths come from parsed expressions, so the same few paths are
+        # converted over and over; remember the conversions
+        self._convert_path_cached = lru_cache(maxsize=1024)(self._convert_path)
 
     def resolve_path(self, path: str, context, raw=False):
         """Main entry point for path resolution with error handling.
@@ -19,7 +84,6 @@ class ResolverSpec:
         protected methods below.
         """
         original_path = path
-        resolver_type = self.__class__.__name__.lower().replace("resolver", "")
         try:
             if raw:
                 # For raw expressions, use dedicated method
@@ -27,16 +91,23 @@ class ResolverSpec:
                 result = self._execute_raw_query(path, context)
             else:
                 # For standard path expressions, convert then execute
-                converted_path = self._convert_path(path)
+                converted_path = self._convert_path_cached(path)
                 self.logger.debug("Converted path '%s' to '%s'", path, converted_path)
                 result = self._execute_query(converted_path, context)
 
             # Handle null/missing results
+            if result is MISSING:
+                raise VariableError(
+                    template_key=self._missing_key(original_path),
+                    path=original_path,
+                    resolver=self._resolver_type(),
+                    details="Path is missing from the context",
+                )
             if result is None:
                 raise VariableError(
                     template_key="unresolved_path",
                     path=original_path,
-                    resolver=resolver_type,
+                    resolver=self._resolver_type(),
                     details="Path resolves to null or is missing",
                 )
 
@@ -48,36 +119,39 @@ class ResolverSpec:
 
         except Exception as e:
             # Handle all other errors with useful context
-            self.logger.warning(f"Error resolving '{original_path}': {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            # Reported to the caller as a VariableError; the traceback is only
+            # formatted if debug logging is on
+            self.logger.debug("Error resolving '%s': %s", original_path, e, exc_info=True)
             if raw:
                 raise VariableError(
                     template_key="invalid_raw_expression",
                     path=original_path,
-                    resolver=resolver_type,
+                    resolver=self._resolver_type(),
                     details=str(e),
                 )
             else:
-                key = (
-                    "undefined_variable"
-                    if original_path.isidentifier()
-                    else "unresolved_path"
-                )
                 raise VariableError(
-                    template_key=key,
+                    template_key=self._missing_key(original_path),
                     path=original_path,
-                    resolver=resolver_type,
+                    resolver=self._resolver_type(),
                     details=str(e),
                 )
 
+    def _resolver_type(self):
+        """Name of this resolver as reported in error messages."""
+        return self.__class__.__name__.lower().replace("resolver", "")
+
+    @staticmethod
+    def _missing_key(path):
+        """Error template for a path that couldn't be found in the context."""
+        return "undefined_variable" if path.isidentifier() else "unresolved_path"
+
     # Protected methods to be implemented by subclasses
     def _convert_path(self, path):
         """Convert a dilemma path to resolver-specific syntax."""
         # Handle possessive paths by default
         if "'s" in path:
-            import re
-
-            return re.sub(r"'s\s+", ".", path)
+            return _POSSESSIVE.sub(".", path)
         return path
 
     def _execute_query(self, converted_path, context):
@@ -1,6 +1,7 @@
 """JQ-based resolver implementation."""
 
 import re
+from functools import lru_cache
 
 try:
     import jq
@@ -11,11 +12,17 @@ except ImportError:
         "Please install it with 'pip install jq' or use a different resolver."
     )
 
-from .interface import ResolverSpec
+from .interface import MISSING, NOT_WALKED, ResolverSpec, path_steps, walk_path_steps
 
 JQ_KEYWORDS = re.compile(r"^\s*(if|map|reduce|foreach|while|until|label|break)\b")
 
 
+@lru_cache(maxsize=1024)
+def _compile_cached(jq_expr: str):
+    """Compile a jq program once; compiled programs are reusable across inputs."""
+    return jq.compile(jq_expr)
+
+
 class JqResolver(ResolverSpec):
     """A resolver using jq (C extension)."""
 
@@ -26,14 +33,22 @@ class JqResolver(ResolverSpec):
         """Execute a jq expression against the context."""
         # Compile and execute the expression
 
-        if path.isidentifier() and isinstance(context, dict):
-            return context[path]
+        if isinstance(context, dict):
+            if path.isidentifier():
+                return context.get(path, MISSING)
+            # Plain names and indexes are followed directly; jq's semantics for
+            # them are the same (null past the end of a list)
+            steps = path_steps(path)
+            if steps is not None:
+                value = walk_path_steps(steps, context)
+                if value is not NOT_WALKED:
+                    return value
 
         if path.startswith("."):
             jq_expr = path
         else:
             jq_expr = "." + path
-        results = jq.compile(jq_expr).input(context).all()
+        results = _compile_cached(jq_expr).input(context).all()
 
         # Return the first result, or None if no results
         if results:
@@ -45,7 +60,7 @@ class JqResolver(ResolverSpec):
 
         For jq, we need special handling of control flow expressions.
         """
-        res = jq.compile(raw_expr).input(context).all()
+        res = _compile_cached(raw_expr).input(context).all()
 
         if res:
             return res[0]
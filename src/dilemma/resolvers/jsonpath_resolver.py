@@ -1,8 +1,16 @@
 """JsonPath-based resolver implementation."""
 
+from functools import lru_cache
+
 from jsonpath_ng import parse
 
-from .interface import ResolverSpec
+from .interface import MISSING, NOT_WALKED, ResolverSpec, path_steps, walk_path_steps
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(jsonpath_expr):
+    """Parse a jsonpath expression once; parsed expressions are reusable."""
+    return parse(jsonpath_expr)
 
 
 class JsonPathResolver(ResolverSpec):
@@ -20,8 +28,21 @@ class JsonPathResolver(ResolverSpec):
 
     def _execute_query(self, jsonpath_expr, context):
         """Execute a jsonpath expression against the context."""
-        # Parse the expression
-        expr = parse(jsonpath_expr)
+        # Paths converted from plain names and indexes ("$.a.b[0]") are followed
+        # directly rather than through jsonpath_ng's pure Python matching
+        if jsonpath_expr.startswith("$.") and isinstance(context, dict):
+            path = jsonpath_expr[2:]
+            if type(context) is dict and path.isidentifier():
+                # A bare name is a top-level key
+                return context.get(path, MISSING)
+            steps = path_steps(path)
+            if steps is not None:
+                value = walk_path_steps(steps, context)
+                if value is not NOT_WALKED:
+                    return value
+
+        # Parse the expression (cached per distinct path)
+        expr = _parse_cached(jsonpath_expr)
 
         # Find matches
         matches = expr.find(context)
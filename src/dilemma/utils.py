@@ -1,4 +1,5 @@
 import functools
+import re
 from datetime import datetime, timedelta, timezone
 
 from .errors import TypeMismatchError
@@ -50,6 +51,10 @@ def reject_strings(left, right, op_symbol: str):
         raise TypeMismatchError(template_key="string_operation", operation=op_symbol)
 
 
+# Containers in which any item can be looked for
+_COLLECTION_TYPES = frozenset({list, tuple, dict})
+
+
 def check_containment(container, item, container_position: str) -> bool:
     """
     Helper function to check if an item is contained in a container.
@@ -65,6 +70,14 @@ def check_containment(container, item, container_position: str) -> bool:
     Raises:
         TypeError: If the container is not a valid container type
     """
+    # Context values are plain JSON types, so an exact type lookup settles
+    # almost every call before the match statement's isinstance checks
+    container_type = type(container)
+    if container_type in _COLLECTION_TYPES:
+        return item in container
+    if container_type is str and type(item) is str:
+        return item in container
+
     match container:
         case list() | tuple():
             return item in container
@@ -83,15 +96,16 @@ def check_containment(container, item, container_position: str) -> bool:
 def temporal_unit_comparison(func):
     """
     Decorator for DateMethods' methods that expect a date-like value,
-    a numeric quantity, and a string unit from Lark's 'items' list.
+    a numeric quantity, and a string unit as the rule's children.
 
-    It unpacks 'items', calls self._ensure_datetime() on the first element,
+    The wrapper takes the children as positional arguments (apply
+    v_args(inline=True) on top of it), calls ensure_datetime() on the first,
     casts the second to float, and passes them along with the third (unit)
     to the decorated function.
     """
 
     @functools.wraps(func)
-    def wrapper(self, items: list):  # 'self' will be an instance of DateMethods
+    def wrapper(self, *items):  # 'self' will be an instance of DateMethods
         from .errors.exc import DateTimeError
 
         if len(items) != 3:
@@ -108,30 +122,59 @@ def temporal_unit_comparison(func):
     return wrapper
 
 
+# Exactly the shapes accepted by DATETIME_FORMATS, which
+# datetime.fromisoformat (implemented in C) parses identically and much faster
+ISO_DATETIME_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}"
+    r"(?:[ T]\d{2}:\d{2}:\d{2}|T\d{2}:\d{2}:\d{2}(?:Z|[+-]\d{2}:?\d{2}))?"
+)
+
+
+DATETIME_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S%z",
+)
+
+
+# Date strings are mostly literals or values repeated across a batch of
+# contexts, so the same few strings are parsed again and again
+@functools.lru_cache(maxsize=256)
+def parse_datetime_string(value: str) -> datetime:
+    """Parse a date string, treating naive datetimes as UTC"""
+    if ISO_DATETIME_PATTERN.fullmatch(value):
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            pass  # e.g. month 13 - let the strptime formats report it
+        else:
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt
+
+    # Try different formats
+    for fmt in DATETIME_FORMATS:
+        try:
+            dt = datetime.strptime(value, fmt)
+            # Make naive datetimes timezone-aware with UTC
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt
+        except ValueError:
+            continue
+    from .errors.exc import DateTimeError
+
+    raise DateTimeError(template_key="date_parsing", value=value)
+
+
 # Helper methods
 def ensure_datetime(value) -> datetime:
     """Convert value to datetime if it's not already"""
     if isinstance(value, datetime):
         return value
     elif isinstance(value, str):
-        # Try different formats
-        for fmt in [
-            "%Y-%m-%d",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S%z",
-        ]:
-            try:
-                dt = datetime.strptime(value, fmt)
-                # Make naive datetimes timezone-aware with UTC
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                return dt
-            except ValueError:
-                continue
-        from .errors.exc import DateTimeError
-
-        raise DateTimeError(template_key="date_parsing", value=value)
+        return parse_datetime_string(value)
     elif isinstance(value, (int, float)):
         # Assume Unix timestamp
         return datetime.fromtimestamp(value, timezone.utc)
@@ -141,36 +184,34 @@ def ensure_datetime(value) -> datetime:
         raise DateTimeError(template_key="date_conversion", type=type(value).__name__)
 
 
+# One unit of each supported time_unit; months and years are approximated
+TIME_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+
+# Quantities and units are nearly always literals, so the same few periods are
+# computed by every evaluation of an expression
+@functools.lru_cache(maxsize=256)
 def create_timedelta(quantity, unit) -> timedelta:
     """Create a timedelta object based on quantity and unit"""
-    # Now unit should be a simple string from one of our unit methods
-    log.debug(f"Unit received: {unit} (type: {type(unit)})")
-
-    if unit == "minute":
-        return timedelta(minutes=quantity)
-    elif unit == "hour":
-        return timedelta(hours=quantity)
-    elif unit == "day":
-        return timedelta(days=quantity)
-    elif unit == "week":
-        return timedelta(weeks=quantity)
-    elif unit == "month":
-        # Approximate month as 30 days
-        return timedelta(days=30 * quantity)
-    elif unit == "year":
-        # Approximate year as 365 days
-        return timedelta(days=365 * quantity)
-    else:
+    base = TIME_UNITS.get(unit)
+    if base is None:
         from .errors.exc import DateTimeError
 
         raise DateTimeError(template_key="unsupported_unit", unit=unit)
+    return base * quantity
 
 
-def unpack_datetimes(items: list) -> tuple[datetime, datetime]:
+def unpack_datetimes(first, second) -> tuple[datetime, datetime]:
     """
-    Extracts items 0 and 1 from the list and passes the values through
-    ensure_datetime
+    Passes both values through ensure_datetime
     """
-    date1 = ensure_datetime(items[0])
-    date2 = ensure_datetime(items[1])
+    date1 = ensure_datetime(first)
+    date2 = ensure_datetime(second)
     return date1, date2
@@ -55,13 +55,14 @@ def nested_data():
 
 def test_execute_query_simple_identifier(resolver, nested_data):
     """Test _execute_query with simple identifier paths."""
+    from dilemma.resolvers.interface import MISSING
+
     # Test simple key lookup for dict - this uses the fast path
     result = resolver._execute_query("status", nested_data)
     assert result == "active"
     
-    # Test missing key - this should raise KeyError based on the implementation
-    with pytest.raises(KeyError):
-        resolver._execute_query("missing", nested_data)
+    # Missing keys are signalled with the MISSING sentinel rather than KeyError
+    assert resolver._execute_query("missing", nested_data) is MISSING
 
 
 def test_execute_query_with_dot_prefix(resolver, nested_data):
@@ -85,3 +86,69 @@ def test_execute_raw_query_empty_results(resolver, nested_data):
     result = resolver._execute_raw_query("empty", nested_data)
     assert result is None
 
+
+def test_converted_paths_are_cached(resolver, nested_data):
+    """Each distinct path is converted once, however often it is resolved."""
+    for _ in range(3):
+        assert resolver.resolve_path("person's name", nested_data) == "John"
+    info = resolver._convert_path_cached.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+def test_dotted_paths_walk_dicts_without_jq(resolver, nested_data):
+    """Paths of plain names through dicts are looked up without compiling jq."""
+    from dilemma.resolvers.interface import MISSING
+
+    with patch("dilemma.resolvers.jq_resolver.jq.compile") as compile_mock:
+        assert resolver._execute_query("person.address.city", nested_data) == "Anytown"
+        assert resolver._execute_query("person.nickname", nested_data) is MISSING
+    compile_mock.assert_not_called()
+
+
+def test_dotted_paths_through_non_dicts_use_jq(resolver, nested_data):
+    """Paths that don't lead through dicts are left to jq and its errors."""
+    from dilemma.errors import VariableError
+
+    with pytest.raises(VariableError):
+        resolver.resolve_path("scores.first", nested_data)
+
+
+def test_indexed_paths_walk_lists_without_jq(resolver, nested_data):
+    """List indexes in plain paths are followed without compiling jq."""
+    with patch("dilemma.resolvers.jq_resolver.jq.compile") as compile_mock:
+        number = resolver._execute_query("person.phones[1].number", nested_data)
+        assert number == "555-5678"
+        assert resolver._execute_query("scores[0]", nested_data) == 85
+        # Like jq, an index past the end gives null
+        assert resolver._execute_query("scores[5]", nested_data) is None
+    compile_mock.assert_not_called()
+
+
+def test_path_steps():
+    """Paths are split into names and indexes once; anything else is left to jq."""
+    from dilemma.resolvers.interface import path_steps
+
+    assert path_steps("a.b[2][0].c") == ("a", "b", 2, 0, "c")
+    assert path_steps(".a") == ("a",)
+    assert path_steps("a.") is None
+    assert path_steps("a | length") is None
+
+
+def test_compiled_programs_are_reused(resolver, nested_data):
+    """Each distinct jq program is compiled once."""
+    from dilemma.resolvers.jq_resolver import _compile_cached
+
+    _compile_cached.cache_clear()
+    for _ in range(3):
+        assert resolver._execute_raw_query(".scores | length", nested_data) == 3
+        assert resolver._execute_query("person.phones[-1].type", nested_data) == "work"
+    assert _compile_cached.cache_info().misses == 2
+
+
+def test_resolution_errors_are_not_logged_as_warnings(resolver, nested_data, caplog):
+    """Errors are raised to the caller, not also written to the log."""
+    from dilemma.errors import VariableError
+
+    with pytest.raises(VariableError):
+        resolver.resolve_path("scores.first", nested_data)
+    assert not [r for r in caplog.records if r.levelname != "DEBUG"]
@@ -87,3 +87,24 @@ def test_raw_expression_with_dollar_prefix(resolver, nested_data):
 def test_possessive_path_conversion(resolver):
     """Test handling of possessive paths."""
     assert resolver._convert_path("person's name") == "$.person.name"
+
+
+def test_parsed_paths_are_reused(resolver, nested_data):
+    """Repeated lookups of a path parse it only once."""
+    from dilemma.resolvers.jsonpath_resolver import _parse_cached
+
+    _parse_cached.cache_clear()
+    for _ in range(3):
+        assert resolver.resolve_path("$.person.phones[*].type", nested_data) == "home"
+    assert _parse_cached.cache_info().misses == 1
+
+
+def test_plain_paths_are_walked_without_jsonpath(resolver, nested_data):
+    """Paths of names and indexes are followed directly, without parsing jsonpath."""
+    from dilemma.resolvers.jsonpath_resolver import _parse_cached
+
+    _parse_cached.cache_clear()
+    assert resolver.resolve_path("person.phones[1].number", nested_data) == "555-5678"
+    assert resolver.resolve_path("person.address.city", nested_data) == "Anytown"
+    assert resolver.resolve_path("status", nested_data) == "active"
+    assert _parse_cached.cache_info().misses == 0
@@ -48,7 +48,7 @@ def test_evaluate_datetime_from_json_string():
     which was moved from lookup_variable to ExpressionTransformer.variable().
     """
     # Create a JSON string with a serialized datetime in the exact format expected by the code
-    # This format must match what DateTimeEncoder.default() produces
+    # This format must match what datetime_default() produces
     json_string = '{"event": {"__datetime__": "2025-05-11T14:30:00+00:00"}}'
 
     # Test evaluation using the JSON string as variables
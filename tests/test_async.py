@@ -0,0 +1,69 @@
+"""Tests for the async evaluation sketch in dilemma.ext.async"""
+
+import asyncio
+import importlib
+
+import pytest
+
+from dilemma import resolvers
+
+# "async" is a keyword, so the module can't be imported with an import statement
+async_ext = importlib.import_module("dilemma.ext.async")
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Record the raw expressions resolved, answering from the context."""
+    calls = []
+
+    async def resolve_path_async(path, context, resolver_name=None, raw=False):
+        calls.append(path)
+        return context[path.lstrip(".")]
+
+    monkeypatch.setattr(resolvers, "resolve_path_async", resolve_path_async)
+    return calls
+
+
+def test_backticked_expressions_are_fetched_once(fetched):
+    result = asyncio.run(
+        async_ext.evaluate_async("`.a` + `.b` == 3 and `.a` == 1", {"a": 1, "b": 2})
+    )
+
+    assert result is True
+    assert sorted(fetched) == [".a", ".b"]
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("`.a` > 5 and `.b` > 5", False),
+        ("`.a` < 5 or `.b` > 5", True),
+        ("(`.a` > 5 and `.b`) or `.a` == 1", True),
+    ],
+)
+def test_skipped_operands_are_not_fetched(fetched, expression, expected):
+    result = asyncio.run(async_ext.evaluate_async(expression, {"a": 1, "b": 2}))
+
+    assert result is expected
+    assert fetched == [".a"]
+
+
+def test_evaluated_right_operand_is_fetched(fetched):
+    result = asyncio.run(
+        async_ext.evaluate_async("`.a` == 1 and `.b` == 2", {"a": 1, "b": 2})
+    )
+
+    assert result is True
+    assert fetched == [".a", ".b"]
+
+
+def test_cancelled_resolver_cancels_evaluation(monkeypatch):
+    async def resolve_path_async(path, context, resolver_name=None, raw=False):
+        if path == ".b":
+            raise asyncio.CancelledError()
+        return context[path.lstrip(".")]
+
+    monkeypatch.setattr(resolvers, "resolve_path_async", resolve_path_async)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(async_ext.evaluate_async("`.a` + `.b` == 3", {"a": 1, "b": 2}))
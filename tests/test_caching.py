@@ -0,0 +1,122 @@
+"""Tests for parse tree and result caching"""
+
+import os
+import stat
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dilemma.lang import evaluate_cached, clear_caches, ProcessedContext
+from dilemma import lang
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_caches()
+    yield
+    clear_caches()
+
+
+def test_evaluate_cached_returns_same_result():
+    assert evaluate_cached("x * 2", {"x": 21}) == 42
+    assert evaluate_cached("x * 2", {"x": 21}) == 42
+    assert len(lang._result_cache) == 1
+
+
+def test_evaluate_cached_hit_skips_evaluation(monkeypatch):
+    assert evaluate_cached("x > 1", {"x": 5}) is True
+
+    def fail(*args, **kwargs):
+        raise AssertionError("evaluate should not be called on a cache hit")
+
+    monkeypatch.setattr(lang, "evaluate", fail)
+    assert evaluate_cached("x > 1", {"x": 5}) is True
+
+
+def test_evaluate_cached_distinguishes_contexts():
+    assert evaluate_cached("x", {"x": 1}) == 1
+    assert evaluate_cached("x", {"x": 2}) == 2
+    # 1, 1.0 and True are equal and hash alike but must not share a cache entry
+    assert evaluate_cached("x", {"x": True}) is True
+    assert isinstance(evaluate_cached("x", {"x": 1.0}), float)
+
+
+def test_evaluate_cached_nested_and_string_contexts():
+    context = {"user": {"roles": ["admin", "dev"]}}
+    assert evaluate_cached("'admin' in user.roles", context) is True
+    assert evaluate_cached("'admin' in user.roles", '{"user": {"roles": []}}') is False
+    assert evaluate_cached("'admin' in user.roles", ProcessedContext(context)) is True
+
+
+def test_evaluate_cached_skips_time_dependent_expressions():
+    assert evaluate_cached("d is $past", {"d": "2000-01-01"}) is True
+    assert evaluate_cached("$now after d", {"d": "2000-01-01"}) is True
+    assert len(lang._result_cache) == 0
+
+
+def test_evaluate_cached_skips_time_dependent_predicates():
+    future = {"events": [{"d": "2999-01-01"}]}
+    assert evaluate_cached("any of events matches |d is $future|", future) is True
+    assert evaluate_cached("any_of(events, `d is $future`)", future) is True
+    assert len(lang._result_cache) == 0
+
+
+def test_evaluate_cached_skips_resolver_expressions():
+    assert evaluate_cached("`.x` > 1", {"x": 5}) is True
+    assert len(lang._result_cache) == 0
+
+
+def test_evaluate_cached_caches_pure_predicates():
+    context = {"items": [{"n": 1}, {"n": 5}]}
+    assert evaluate_cached("any of items matches |n > 2|", context) is True
+    assert len(lang._result_cache) == 1
+
+
+def test_evaluate_cached_distinguishes_timezones():
+    e = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    utc = datetime(2024, 1, 1, 23, 30, tzinfo=timezone.utc)
+    plus_two = datetime(2024, 1, 2, 1, 30, tzinfo=timezone(timedelta(hours=2)))
+    assert utc == plus_two
+
+    assert evaluate_cached("d same_day_as e", {"d": utc, "e": e}) is True
+    assert evaluate_cached("d same_day_as e", {"d": plus_two, "e": e}) is False
+
+
+def test_evaluate_cached_returns_copies_of_containers():
+    first = evaluate_cached("items", {"items": [1, 2]})
+    first.append(3)
+    assert evaluate_cached("items", {"items": [1, 2]}) == [1, 2]
+
+
+def test_evaluate_cached_is_bounded(monkeypatch):
+    monkeypatch.setattr(lang, "RESULT_CACHE_SIZE", 2)
+    for i in range(5):
+        evaluate_cached("x + 1", {"x": i})
+    assert len(lang._result_cache) == 2
+
+
+def test_grammar_cache_is_in_a_private_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = lang.grammar_cache_path()
+
+    directory = tmp_path / "dilemma"
+    assert os.path.dirname(path) == str(directory)
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_grammar_cache_disabled_for_shared_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    (tmp_path / "dilemma").mkdir(mode=0o777)
+    os.chmod(tmp_path / "dilemma", 0o777)
+
+    assert lang.grammar_cache_path() is False
+
+
+def test_grammar_cache_disabled_for_symlink(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    (tmp_path / "dilemma").symlink_to(target)
+
+    assert lang.grammar_cache_path() is False
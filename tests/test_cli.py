@@ -1,6 +1,7 @@
 import json
 from unittest.mock import patch, MagicMock, ANY
 from pathlib import Path
+from datetime import datetime, timezone
 
 import pytest
 import yaml
@@ -116,9 +117,13 @@ def test_create_time_values():
 # Test process_time_values_for_docs function
 def test_process_time_values():
     """Test processing time values for documentation."""
-    from dilemma.ext.cli import process_time_values_for_docs, create_time_values
+    from dilemma.ext.cli import (
+        create_time_values,
+        format_time_values,
+        process_time_values_for_docs,
+    )
 
-    time_values = create_time_values()
+    time_values = format_time_values(create_time_values())
 
     # Test with various data structures
     test_data = {
@@ -136,6 +141,25 @@ def test_process_time_values():
     assert processed["normal"] == "not a placeholder"  # Unchanged
 
 
+def test_process_preformatted_time_values():
+    """Preformatted time values are substituted as-is."""
+    from dilemma.ext.cli import (
+        DOCS_TIME_FORMAT,
+        create_time_values,
+        format_time_values,
+        process_time_values_for_docs,
+    )
+
+    time_values = create_time_values()
+    formatted = format_time_values(time_values)
+    test_data = {"when": "__NOW__", "list": ["__LAST_WEEK__"]}
+
+    assert process_time_values_for_docs(test_data, formatted) == {
+        "when": time_values["__NOW__"].strftime(DOCS_TIME_FORMAT),
+        "list": [time_values["__LAST_WEEK__"].strftime(DOCS_TIME_FORMAT)],
+    }
+
+
 def test_variable_expression_with_debug(runner):
     """Test expressions with variables and debug output."""
     # Instead of passing JSON via stdin, create a temp file
@@ -271,3 +295,46 @@ def test_gendocs_error_handling(runner):
         # Verify error is handled
         assert result.exit_code != 0
         assert "Error generating documentation" in result.output
+
+
+def test_dumps_json_renders_unknown_types_as_strings():
+    """Docs JSON falls back to str() for values JSON can't represent."""
+    from datetime import date
+    from dilemma.ext.cli import dumps_json
+
+    assert json.loads(dumps_json({"when": date(2024, 1, 2), "n": [1]})) == {
+        "when": "2024-01-02",
+        "n": [1],
+    }
+
+
+DOCS_JSON_DATA = {
+    1: "int key",
+    "name": "café",
+    "big": 2**70,
+    "float": 1e16,
+    "when": datetime(2024, 1, 2, tzinfo=timezone.utc),
+    "nested": [{"ok": True, "none": None}],
+}
+
+
+def test_dumps_json_without_orjson(monkeypatch):
+    from dilemma.ext import cli
+
+    monkeypatch.setattr(cli, "orjson", None)
+    assert cli.dumps_json(DOCS_JSON_DATA) == json.dumps(
+        DOCS_JSON_DATA, indent=2, default=str
+    )
+
+
+@pytest.mark.parametrize("data", [DOCS_JSON_DATA, {**DOCS_JSON_DATA, "big": 1}])
+def test_dumps_json_with_orjson(data):
+    """orjson's output decodes to the same JSON, falling back where it can't."""
+    pytest.importorskip("orjson")
+    from dilemma.ext import cli
+
+    expected = json.dumps(data, indent=2, default=str)
+    output = cli.dumps_json(data)
+    assert json.loads(output) == json.loads(expected)
+    # Only json escapes non-ASCII text; orjson handles all but the 2**70
+    assert ("café" in output) == (data["big"] == 1)
@@ -0,0 +1,271 @@
+"""Tests for compiling parse trees into closures"""
+
+import pytest
+from lark import Transformer, v_args
+
+from dilemma.compiled import compile_tree
+from dilemma.lang import ExpressionTransformer, build_parser
+
+
+@pytest.mark.parametrize(
+    "expression, context",
+    [
+        ("1 + 2 * 3", {}),
+        ("-4 / 2 - 1.5", {}),
+        ("(x + 1) * 2 == 8", {"x": 3}),
+        ("'a' + 'b' in names or false", {"names": ["ab"]}),
+        (
+            "user.age >= 18 and user's name like 'b*'",
+            {"user": {"age": 20, "name": "bob"}},
+        ),
+        ("items is $empty", {"items": []}),
+        ("d before '2030-01-01' and d older than 2 days", {"d": "2020-01-01"}),
+        ("count_of(items, `. > 1`) == 2", {"items": [1, 2, 3]}),
+        ("at least 1 of items matches |n > 1|", {"items": [{"n": 2}]}),
+        ("`.items | length` == 3", {"items": [1, 2, 3]}),
+    ],
+)
+def test_compiled_matches_transformer(expression, context):
+    tree = build_parser().parse(expression)
+    program = compile_tree(tree, ExpressionTransformer)
+
+    expected = ExpressionTransformer(processed_json=context).transform(tree)
+    assert program(ExpressionTransformer(processed_json=context)) == expected
+
+
+def test_handler_errors_propagate_unwrapped():
+    tree = build_parser().parse("'a' like 1")
+    program = compile_tree(tree, ExpressionTransformer)
+
+    with pytest.raises(TypeError, match="Pattern matching requires string operands"):
+        program(ExpressionTransformer())
+
+
+def test_missing_handler_falls_back_to_default():
+    class PartialTransformer(Transformer):
+        def int_number(self, items):
+            return int(items[0])
+
+    tree = build_parser().parse("1 + 2")
+    program = compile_tree(tree, PartialTransformer)
+    result = program(PartialTransformer())
+
+    assert result.data == "add"
+    assert result.children == [1, 2]
+
+
+def test_program_is_single_generated_function():
+    tree = build_parser().parse("(1 + 2) * 3 > 4 and true")
+    program = compile_tree(tree, ExpressionTransformer)
+
+    assert program.__code__.co_filename == "<dilemma>"
+    assert program(ExpressionTransformer()) is True
+
+
+def test_token_text_is_never_executed():
+    expression = "'__import__(\"os\").getcwd()' == x"
+    tree = build_parser().parse(expression)
+    program = compile_tree(tree, ExpressionTransformer)
+
+    context = {"x": '__import__("os").getcwd()'}
+    assert program(ExpressionTransformer(processed_json=context)) is True
+
+
+def test_literals_are_evaluated_at_compile_time():
+    class CountingTransformer(ExpressionTransformer):
+        calls = 0
+
+        def true_value(self, _):
+            CountingTransformer.calls += 1
+            return True
+
+    tree = build_parser().parse("x and true")
+    program = compile_tree(tree, CountingTransformer)
+    assert CountingTransformer.calls == 1
+
+    for _ in range(3):
+        assert program(CountingTransformer(processed_json={"x": 1})) is True
+    assert CountingTransformer.calls == 1
+
+
+def test_constant_errors_raise_at_run_time():
+    class BrokenTransformer(ExpressionTransformer):
+        def int_number(self, items):
+            raise ValueError("bad number")
+
+    tree = build_parser().parse("1")
+    program = compile_tree(tree, BrokenTransformer)
+
+    with pytest.raises(ValueError, match="bad number"):
+        program(BrokenTransformer())
+
+
+def test_constant_subtrees_are_folded():
+    calls = []
+
+    class RecordingTransformer(ExpressionTransformer):
+        @v_args(inline=True)
+        def mul(self, left, right):
+            calls.append((left, right))
+            return left * right
+
+    tree = build_parser().parse("x * (60 * 60 * 24) > 2 * 3")
+    program = compile_tree(tree, RecordingTransformer)
+    calls.clear()
+
+    # Only the multiplication involving the variable is left to run
+    assert program(RecordingTransformer(processed_json={"x": 1})) is True
+    assert calls == [(1, 86400)]
+
+
+def test_folded_division_by_zero_raises_when_evaluated():
+    from dilemma.errors import DilemmaError
+    from dilemma.lang import compile_expression
+
+    compiled = compile_expression("1 / (2 - 2)")
+    with pytest.raises(DilemmaError):
+        compiled.evaluate()
+
+
+def test_and_or_skip_the_right_operand():
+    from dilemma.lang import evaluate
+
+    # The right operand is never resolved, so the missing variable doesn't raise
+    assert evaluate("x > 1 and missing", {"x": 0}) is False
+    assert evaluate("x > 1 or missing", {"x": 2}) is True
+    assert evaluate("x > 1 and y", {"x": 2, "y": 3}) is True
+
+
+def test_constant_left_operand_decides_at_compile_time():
+    lookups = []
+
+    class RecordingTransformer(ExpressionTransformer):
+        @v_args(inline=True)
+        def variable(self, token):
+            lookups.append(str(token))
+            return super().variable(token)
+
+    tree = build_parser().parse("false and x")
+    program = compile_tree(tree, RecordingTransformer)
+
+    assert program.constant
+    assert program(RecordingTransformer()) is False
+    assert lookups == []
+
+
+def test_python_operators_are_inlined():
+    from dilemma.errors import TypeMismatchError
+
+    tree = build_parser().parse("x + 1 < y")
+    program = compile_tree(tree, ExpressionTransformer)
+
+    assert program(ExpressionTransformer(processed_json={"x": 1, "y": 2.5})) is True
+    assert program(ExpressionTransformer(processed_json={"x": 2, "y": 3})) is False
+    # Operands of other types still go through the handler and its checks
+    with pytest.raises(TypeMismatchError):
+        program(ExpressionTransformer(processed_json={"x": "a", "y": 3}))
+
+
+def test_replaced_operator_handler_is_called():
+    calls = []
+
+    class RecordingTransformer(ExpressionTransformer):
+        @v_args(inline=True)
+        def add(self, left, right):
+            calls.append((left, right))
+            return left + right
+
+    tree = build_parser().parse("x + 1")
+    program = compile_tree(tree, RecordingTransformer)
+
+    assert program(RecordingTransformer(processed_json={"x": 1})) == 2
+    assert calls == [(1, 1)]
+
+
+def test_fully_folded_programs_are_constant():
+    tree = build_parser().parse("2 * (3 + 4) > 10")
+    program = compile_tree(tree, ExpressionTransformer)
+    assert program.constant
+    assert program(None) is True
+
+    program = compile_tree(build_parser().parse("x * 2"), ExpressionTransformer)
+    assert not program.constant
+
+
+def test_parentheses_are_skipped():
+    class RecordingTransformer(ExpressionTransformer):
+        @v_args(inline=True)
+        def paren(self, value):
+            raise AssertionError("paren handler called")
+
+    tree = build_parser().parse("((x))")
+    program = compile_tree(tree, RecordingTransformer)
+
+    assert program(RecordingTransformer(processed_json={"x": 4})) == 4
+
+
+def test_repeated_variables_are_looked_up_once():
+    lookups = []
+
+    class RecordingTransformer(ExpressionTransformer):
+        @v_args(inline=True)
+        def variable(self, token):
+            lookups.append(str(token))
+            return super().variable(token)
+
+    tree = build_parser().parse("x > 1 and x < 5 and (y or x == 3)")
+    program = compile_tree(tree, RecordingTransformer)
+
+    assert program(RecordingTransformer(processed_json={"x": 3, "y": False})) is True
+    assert lookups == ["x", "y"]
+
+    # A lookup in a skipped operand isn't relied on afterwards
+    tree = build_parser().parse("(y and z) or z")
+    program = compile_tree(tree, ExpressionTransformer)
+    assert program(ExpressionTransformer(processed_json={"y": False, "z": 7})) is True
+
+
+def test_repeated_paths_are_resolved_once(monkeypatch):
+    from dilemma import lang
+
+    resolved = []
+    resolve_path = lang.resolve_path
+
+    def counting_resolve_path(path, context, *args, **kwargs):
+        resolved.append(path)
+        return resolve_path(path, context, *args, **kwargs)
+
+    monkeypatch.setattr(lang, "resolve_path", counting_resolve_path)
+
+    context = {"user": {"age": 30}}
+    expression = "user.age > 18 and user.age < 65 and user.age != 40"
+    assert lang.evaluate(expression, context) is True
+    assert resolved == ["user.age"]
+
+
+def test_time_units_are_folded():
+    calls = []
+
+    class RecordingTransformer(ExpressionTransformer):
+        def day_unit(self, _):
+            calls.append("day")
+            return "day"
+
+    tree = build_parser().parse("d older than 2 days")
+    program = compile_tree(tree, RecordingTransformer)
+    calls.clear()
+
+    context = {"d": "2020-01-01"}
+    assert program(RecordingTransformer(processed_json=context)) is True
+    assert calls == []
+
+
+def test_equality_is_inlined_for_exact_types():
+    tree = build_parser().parse("status == 'active' and score != 1")
+    program = compile_tree(tree, ExpressionTransformer)
+
+    context = {"status": "active", "score": 2}
+    assert program(ExpressionTransformer(processed_json=context))
+    # Floats still compare within FLOAT_EPSILON, through the handler
+    context = {"status": "active", "score": 1.00000000001}
+    assert not program(ExpressionTransformer(processed_json=context))
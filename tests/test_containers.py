@@ -251,3 +251,15 @@ def test_empty_containers():
     assert evaluate("empty_list is $empty and empty_dict is $empty", variables) is True
     assert evaluate("filled_list is $empty or empty_list is $empty", variables) is True
     assert evaluate("(filled_dict is $empty) == false", variables) is True
+
+
+def test_check_containment_container_subclasses():
+    """Subclasses of the container types are matched like the types themselves."""
+    from collections import OrderedDict
+
+    from dilemma.utils import check_containment
+
+    assert check_containment(OrderedDict(a=1), "a", "right") is True
+    assert check_containment(["a"], "a", "right") is True
+    with pytest.raises(ContainerError):
+        check_containment("abc", 1, "right")
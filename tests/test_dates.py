@@ -275,3 +275,72 @@ def test_date_older_than_within_property(days_ago):
     assert evaluate(f"test_date older than {days_ago - 1} days", variables) is True
     assert evaluate(f"test_date older than {days_ago + 1} days", variables) is False
 
+
+def test_now_is_captured_once_per_evaluation():
+    """All date predicates in one evaluation share the same 'now'."""
+    from dilemma.lang import ExpressionTransformer
+
+    transformer = ExpressionTransformer()
+    first = transformer.now_value(None)
+    assert transformer.now_value(None) is first
+
+    local_tz = timezone(timedelta(hours=5))
+    assert transformer._now(local_tz) == first
+    assert transformer._now(local_tz).tzinfo is local_tz
+
+    # A new evaluation gets a fresh instant
+    assert ExpressionTransformer()._now_utc is None
+    assert evaluate("$now same_day_as $now") is True
+
+
+@pytest.mark.parametrize(
+    "value, fmt",
+    [
+        ("2024-03-05", "%Y-%m-%d"),
+        ("2024-03-05 06:07:08", "%Y-%m-%d %H:%M:%S"),
+        ("2024-03-05T06:07:08", "%Y-%m-%dT%H:%M:%S"),
+        ("2024-03-05T06:07:08Z", "%Y-%m-%dT%H:%M:%S%z"),
+        ("2024-03-05T06:07:08+0130", "%Y-%m-%dT%H:%M:%S%z"),
+        ("2024-03-05T06:07:08-01:30", "%Y-%m-%dT%H:%M:%S%z"),
+        ("2024-3-5", "%Y-%m-%d"),  # not ISO shaped, parsed by strptime
+    ],
+)
+def test_ensure_datetime_matches_strptime(value, fmt):
+    """The ISO fast path gives the same result as the strptime formats."""
+    expected = datetime.strptime(value, fmt)
+    if expected.tzinfo is None:
+        expected = expected.replace(tzinfo=timezone.utc)
+
+    result = ensure_datetime(value)
+    assert result == expected
+    assert result.utcoffset() == expected.utcoffset()
+
+
+def test_ensure_datetime_invalid_iso_shaped_string():
+    with pytest.raises(DateTimeError):
+        ensure_datetime("2024-13-45")
+
+
+def test_ensure_datetime_reuses_parsed_strings():
+    assert ensure_datetime("2024-03-05T06:07:08Z") is ensure_datetime(
+        "2024-03-05T06:07:08Z"
+    )
+
+
+@pytest.mark.parametrize(
+    "quantity, unit, expected",
+    [
+        (2, "minute", timedelta(minutes=2)),
+        (1.5, "hour", timedelta(minutes=90)),
+        (3, "day", timedelta(days=3)),
+        (2, "week", timedelta(days=14)),
+        (1, "month", timedelta(days=30)),
+        (0.5, "year", timedelta(days=182.5)),
+    ],
+)
+def test_create_timedelta_units(quantity, unit, expected):
+    assert create_timedelta(quantity, unit) == expected
+
+
+def test_create_timedelta_reuses_periods():
+    assert create_timedelta(2, "day") is create_timedelta(2, "day")
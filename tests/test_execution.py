@@ -118,3 +118,12 @@ def test_visit_error_without_original_exception():
     assert exc_info.value.context["expression"] == expression
     assert exc_info.value.context["error_type"] == "VisitError"
     assert exc_info.value.__cause__ is visit_error
+
+
+def test_handled_errors_are_not_logged_as_warnings(caplog):
+    """Failed evaluations only log at debug level, not on every failure."""
+    with pytest.raises(EvaluationError):
+        with execution_error_handling("test expression"):
+            raise ValueError("Custom error message")
+
+    assert not [r for r in caplog.records if r.levelname != "DEBUG"]
@@ -7,6 +7,7 @@ from dilemma.lang import (
     MAX_STRING_LENGTH,
     ExpressionTransformer,
     compile_expression,
+    ProcessedContext,
 )
 from dilemma.errors import DilemmaError, VariableError, TypeMismatchError
 
@@ -72,24 +73,18 @@ class CustomTransformer(ExpressionTransformer):
 
 def test_other_visit_errors(monkeypatch):
     """Test that other VisitErrors are properly handled"""
+    from dilemma.lang import clear_caches
 
-    # Create an instance of our custom transformer
-    custom_transformer = CustomTransformer()
+    # Handlers are bound when an expression is compiled, so patch the class
+    # and discard any previously compiled programs
+    monkeypatch.setattr(ExpressionTransformer, "mul", CustomTransformer.mul)
+    clear_caches()
 
-    # Keep the original function to restore later
-    original_transform = ExpressionTransformer.transform
-
-    # Replace the transform method on the ExpressionTransformer class
-    def mock_transform(self, tree):
-        if self.__class__ == ExpressionTransformer:
-            return custom_transformer.transform(tree)
-        return original_transform(self, tree)
-
-    # Apply the monkeypatch to the class method
-    monkeypatch.setattr(ExpressionTransformer, "transform", mock_transform)
-
-    with pytest.raises(DilemmaError) as excinfo:
-        evaluate("3 * 4")
+    try:
+        with pytest.raises(DilemmaError) as excinfo:
+            evaluate("3 * 4")
+    finally:
+        clear_caches()
 
     # Check that the error message contains the expression
     assert "3 * 4" in str(excinfo.value)
@@ -128,6 +123,13 @@ def test_comparison_operators():
         assert evaluate(expr) == expected
 
 
+def test_float_epsilon_is_still_a_class_attribute():
+    from dilemma.lang import FLOAT_EPSILON
+
+    assert ExpressionTransformer.EPSILON == FLOAT_EPSILON
+    assert evaluate(f"0.1 == {0.1 + ExpressionTransformer.EPSILON / 2}") is True
+
+
 def test_comparison_with_arithmetic():
     """Test comparison operators combined with arithmetic operations"""
     test_cases = [
@@ -170,30 +172,41 @@ def test_thread_safety():
     assert results == [2, 6, 2.0]
 
 
-def test_variables_processing_json_error(monkeypatch):
+def test_variables_processing_json_error():
     """Test that errors during JSON processing raise the appropriate error"""
-    import json
-    import dilemma.lang
-
-    # Create a mock json.dumps that raises an error
-    original_dumps = json.dumps
+    # JSON objects can't have tuple keys
+    with pytest.raises(DilemmaError) as excinfo:
+        evaluate("1 + 1", context={"nested": {("a", "b"): "value"}})
 
-    def mock_dumps(*args, **kwargs):
-        # Only raise the error for our specific test case
-        if args and isinstance(args[0], dict) and "trigger_error" in args[0]:
-            raise TypeError("Mock JSON processing error")
-        return original_dumps(*args, **kwargs)
+    # Check the error message matches what we expect
+    assert "Failed to process variables" in str(excinfo.value)
+    assert "keys must be str" in str(excinfo.value)
 
-    # Apply the monkeypatch
-    monkeypatch.setattr(json, "dumps", mock_dumps)
 
-    # Test that the error path in ExpressionTransformer.__init__ is triggered
+def test_variables_processing_unserializable_value():
     with pytest.raises(DilemmaError) as excinfo:
-        evaluate("1 + 1", context={"trigger_error": "value"})
+        evaluate("1 + 1", context={"nested": {"value": object()}})
 
-    # Check the error message matches what we expect
-    assert "Failed to process variables" in str(excinfo.value)
-    assert "Mock JSON processing error" in str(excinfo.value)
+    assert "not JSON serializable" in str(excinfo.value)
+
+
+def test_variables_processing_matches_json_round_trip():
+    import json
+    from datetime import datetime
+
+    from dilemma.dates import datetime_default
+    from dilemma.lang import _process_variables
+
+    variables = {
+        "user": {"name": "bob", "tags": ("a", "b"), 1: "one"},
+        "items": [1, 2.5, True, None, {"when": datetime(2024, 1, 2, 3, 4, 5)}],
+    }
+    expected = json.loads(json.dumps(variables, default=datetime_default))
+    processed = _process_variables(variables)
+
+    assert processed == expected
+    # The result is a copy, unaffected by later changes to the variables
+    assert processed["items"] is not variables["items"]
 
 
 def test_compiled_expression():
@@ -243,6 +256,22 @@ def test_compiled_expression_error_handling():
         expr.evaluate(variables)
 
 
+def test_compiled_expression_evaluate_batch():
+    """Test evaluating a compiled expression against several contexts at once"""
+    expr = compile_expression("x * 2 > limit")
+    contexts = [
+        {"x": 1, "limit": 1},
+        '{"x": 3, "limit": 7}',
+        ProcessedContext({"x": 5, "limit": 9}),
+    ]
+
+    assert expr.evaluate_batch(contexts) == [expr.evaluate(c) for c in contexts]
+    assert compile_expression("1 + 1").evaluate_batch([{}, {}]) == [2, 2]
+
+    with pytest.raises(DilemmaError):
+        expr.evaluate_batch([{"x": 1, "limit": 1}, {"x": 1}])
+
+
 def test_jq_expressions():
     """Test that JQ expressions work correctly"""
     # Test data
@@ -374,11 +403,76 @@ def test_pattern_matching_type_error():
     for expr in test_cases:
         with pytest.raises(DilemmaError) as excinfo:
             evaluate(expr)
-        # Should contain the TypeError message wrapped in VisitError/EvaluationError
+        # Should contain the TypeError message wrapped in EvaluationError
         assert "Pattern matching requires string operands" in str(excinfo.value)
+        # The handler's own exception is the cause, not a VisitError around it
+        assert isinstance(excinfo.value.__cause__, TypeError)
 
 
 def test_possesive_lookup():
     expr = "user's name =='bob'"
     context = {"user": {"name": "bob"}}
     assert evaluate(expr, context) is True
+
+
+def test_bare_names_use_a_registered_resolver(monkeypatch):
+    from dilemma import resolvers
+    from dilemma.resolvers.basic_resolver import BasicResolver
+
+    class UpperResolver(BasicResolver):
+        def _execute_query(self, converted_path, context):
+            return super()._execute_query(converted_path, context).upper()
+
+    monkeypatch.setattr(resolvers, "_resolvers", dict(resolvers._resolvers))
+    monkeypatch.setattr(resolvers, "_default_resolver", resolvers._default_resolver)
+    resolvers.register_resolver(UpperResolver)
+
+    assert evaluate("name", {"name": "bob"}) == "BOB"
+    assert evaluate("name == 'BOB'", {"name": "bob"}) is True
+
+
+def test_parse_tree_cache_reused():
+    """Repeated evaluations of the same expression share one cached parse tree"""
+    from dilemma.lang import _parse_cached, _compile_cached, clear_caches
+
+    clear_caches()
+    assert evaluate("x + 1", {"x": 1}) == 2
+    assert evaluate("x + 1", {"x": 2}) == 3
+    assert compile_expression("x + 1").evaluate({"x": 3}) == 4
+
+    assert _parse_cached.cache_info().misses == 1
+    info = _compile_cached.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def test_pooled_transformers_do_not_leak_state():
+    """Transformers are reused between evaluations without carrying state over"""
+    assert evaluate("x", {"x": 1}) == 1
+    with pytest.raises(VariableError):
+        evaluate("x")
+    # Nested evaluation (array predicates) while the outer transformer is in use
+    context = {"items": [{"v": 1}, {"v": 5}], "limit": 3}
+    assert evaluate("limit == 3 and any of items matches |v > 3| and limit > 2", context)
+
+
+def test_idle_transformers_release_their_context():
+    from dilemma.lang import _free_transformers
+
+    evaluate("x > 1", {"x": 5})
+    compile_expression("x > 1").evaluate_batch([{"x": 1}, {"x": 2}])
+
+    for transformer in _free_transformers():
+        assert transformer.processed_json == {}
+        assert transformer._now_utc is None
+
+
+def test_parse_errors_not_cached():
+    """Syntax errors are raised every time rather than cached"""
+    from dilemma.lang import _parse_cached, clear_caches
+
+    clear_caches()
+    for _ in range(2):
+        with pytest.raises(DilemmaError):
+            evaluate("1 +")
+    assert _parse_cached.cache_info().currsize == 0
@@ -367,3 +367,13 @@ def test_logger_debug_on_resolution():
         
         # Should have called logger.debug
         mock_logger.debug.assert_called_with("Resolving path %s with resolver %s", "test", "basic")
+
+
+def test_missing_identifier_is_undefined_variable():
+    """A missing top-level name is reported as undefined, not as a failed lookup."""
+    from dilemma.errors import VariableError
+    from dilemma.resolvers.jq_resolver import JqResolver
+
+    with pytest.raises(VariableError) as exc_info:
+        JqResolver().resolve_path("nosuchname", {"name": "x"})
+    assert exc_info.value.template_key == "undefined_variable"
@@ -84,3 +84,12 @@ def test_string_pattern_matching():
 
     # Test case insensitivity (fnmatch is case-sensitive by default)
     assert evaluate("'Hello.txt' like '*hello.txt'")
+
+
+def test_string_literal_without_escapes_is_unchanged():
+    assert evaluate("'plain text'") == "plain text"
+    assert evaluate("'tab\\there'") == "tab\there"
+
+
+def test_string_literal_escapes_keep_non_ascii_text():
+    assert evaluate("'café\\tnaïve 中文'") == "café\tnaïve 中文"